@@ -4,6 +4,7 @@ from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
 from config.settings import config
+from app.utils.json_provider import FastJSONProvider
 
 db = SQLAlchemy()
 migrate = Migrate()
@@ -11,9 +12,14 @@ jwt = JWTManager()
 
 def create_app(config_name='development'):
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
 
     app.config.from_object(config.get(config_name))
     
+    # Instrumented connection pool for server databases (before the engine is created)
+    from app.utils.db_pool import init_db_pool
+    init_db_pool(app)
+    
     # Initialize extensions
     db.init_app(app)
     migrate.init_app(app, db)
@@ -51,6 +57,26 @@ def create_app(config_name='development'):
     app.register_blueprint(tasks_bp)
     app.register_blueprint(ai_bp)
     
+    # Opt-in per-request SQL profiling (SQL_PROFILER)
+    from app.utils.sql_profiler import init_sql_profiler
+    init_sql_profiler(app)
+    
+    # Password hashing work factor and pool
+    from app.services.password_service import password_hasher
+    password_hasher.init_app(app)
+    
+    # Verified token and user/role caches for authenticated requests
+    from app.utils.auth_cache import init_auth_cache
+    init_auth_cache(app)
+    
+    # Dashboard stats snapshots, invalidated on flush
+    from app.services.stats_cache import init_stats_cache
+    init_stats_cache(app)
+    
+    # Register CLI commands
+    from app.cli import register_commands
+    register_commands(app)
+    
     # Register models for migration
     from app.models.test_record import TestRecord
     
@@ -59,4 +85,18 @@ def create_app(config_name='development'):
     def health_check():
         return {'status': 'ok'}, 200
     
+    # Connection pool occupancy and checkout waits for this worker process; only served
+    # with `Authorization: Bearer <POOL_METRICS_TOKEN>` when that token is configured
+    @app.route('/health/pool', methods=['GET'])
+    def pool_health():
+        from flask import abort, request
+        from app.utils.db_pool import pool_status
+        token = app.config.get('POOL_METRICS_TOKEN')
+        if not token:
+            abort(404)
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return {'error': 'Unauthorized'}, 401
+        options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+        return pool_status(db.engine, options.get('max_overflow')), 200
+    
     return app
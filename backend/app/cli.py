@@ -0,0 +1,107 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+
+
+@click.command('export-projects')
+@click.argument('project_ids', nargs=-1, type=int, required=True)
+@click.option('--out-dir', type=click.Path(file_okay=False), help='Write one zip per project into this directory.')
+@click.option('--archive', type=click.Path(dir_okay=False), help='Write a single combined archive to this path.')
+@click.option('--compression', type=click.Choice(['store', 'fast', 'default', 'best']), default='default', show_default=True)
+@click.option('--workers', type=int, default=None, help='Process pool size (defaults to BULK_EXPORT_WORKERS or CPU count).')
+@click.option('--profile', type=click.Choice(['development', 'production']), default=None, help='Generation profile for every project.')
+@click.option('--instrumentation', is_flag=True, help='Include request metrics in the generated backends.')
+@click.option('--fast-json', is_flag=True, help='Include the orjson response provider in the generated backends.')
+@with_appcontext
+def export_projects_command(project_ids, out_dir, archive, compression, workers, profile, instrumentation, fast_json):
+    """Export several projects at once for backups and CI snapshots"""
+    from app.services.export_service import ExportService
+
+    if bool(out_dir) == bool(archive):
+        raise click.UsageError('Specify exactly one of --out-dir or --archive')
+
+    options = {'instrumentation': instrumentation, 'fast_json': fast_json}
+    if profile:
+        options['profile'] = profile
+    exports = ExportService.load_exports(list(project_ids), options=options)
+    missing = sorted(set(project_ids) - {e['id'] for e in exports})
+    if missing:
+        click.echo(f"Skipping unknown or deleted projects: {', '.join(map(str, missing))}", err=True)
+    if not exports:
+        raise click.ClickException('No projects to export')
+
+    results = []
+
+    def progress(done, total, export, error=None):
+        results.append(error is None)
+        status = f"failed: {error}" if error else 'ok'
+        click.echo(f"[{done}/{total}] {export['filename']} {status}")
+
+    workers = workers or current_app.config.get('BULK_EXPORT_WORKERS')
+    if out_dir:
+        ExportService.write_directory(exports, out_dir, compression, workers, progress)
+    else:
+        with open(archive, 'wb') as fh:
+            for chunk in ExportService.stream_archive(exports, compression, workers, progress):
+                fh.write(chunk)
+
+    failed = results.count(False)
+    click.echo(f"Exported {results.count(True)} project(s), {failed} failed")
+    if failed:
+        raise SystemExit(1)
+
+
+@click.command('usage-rollup')
+@click.option('--days', type=int, default=2, show_default=True, help='Rebuild rollups for this many closed days before today.')
+@click.option('--all', 'rebuild_all', is_flag=True, help='Rebuild every closed day still within API_LOG_RETENTION_DAYS.')
+@with_appcontext
+def usage_rollup_command(days, rebuild_all):
+    """
+    Rebuild API usage rollups of closed days and hours from raw request logs (repair). Run
+    once with --all after upgrading: request logs written before the rollup tables existed
+    are not counted until then. Today's buckets are maintained live and never rebuilt.
+    """
+    from datetime import datetime, timedelta
+    from app.services.usage_service import UsageService
+
+    since = datetime.min if rebuild_all else datetime.utcnow() - timedelta(days=max(days, 0))
+    result = UsageService.compact(since, current_app.config.get('API_LOG_RETENTION_DAYS', 0))
+    click.echo(f"Rebuilt {result['daily_rows']} daily and {result['hourly_rows']} hourly rollup row(s) over {result['days']} day(s)")
+
+
+@click.command('usage-purge')
+@click.option('--batch-size', type=int, default=1000, show_default=True)
+@with_appcontext
+def usage_purge_command(batch_size):
+    """Delete request logs and hourly rollups past API_LOG_RETENTION_DAYS / API_USAGE_HOURLY_RETENTION_DAYS"""
+    from app.services.usage_service import UsageService
+
+    purged = UsageService.purge(
+        current_app.config.get('API_LOG_RETENTION_DAYS', 0),
+        current_app.config.get('API_USAGE_HOURLY_RETENTION_DAYS', 0),
+        batch_size
+    )
+    click.echo(f"Purged {purged['logs']} request log(s) and {purged['hourly']} hourly rollup row(s)")
+
+
+@click.command('purge-test-records')
+@click.option('--project', 'project_id', type=int, default=None, help='Drop every test record of this project instead.')
+@click.option('--batch-size', type=int, default=1000, show_default=True)
+@with_appcontext
+def purge_test_records_command(project_id, batch_size):
+    """Delete wizard test records past their TTL (TEST_RECORD_TTL_DAYS or the project's override)"""
+    from app.services.retention_service import RetentionService
+
+    if project_id is not None:
+        purged = RetentionService.purge_project_test_records(project_id, batch_size)
+    else:
+        purged = RetentionService.purge_test_records(current_app.config.get('TEST_RECORD_TTL_DAYS', 0), batch_size)
+    click.echo(f"Purged {purged} test record(s)")
+
+
+def register_commands(app):
+    """Register Flask CLI commands"""
+    app.cli.add_command(export_projects_command)
+    app.cli.add_command(usage_rollup_command)
+    app.cli.add_command(usage_purge_command)
+    app.cli.add_command(purge_test_records_command)
@@ -6,6 +6,7 @@ from app.models.function import CustomFunction
 from app.models.file import FileUpload
 from app.models.task import BackgroundTask
 from app.models.api_request_log import ApiRequestLog
+from app.models.api_usage import ApiUsageDaily, ApiUsageHourly
 from app import db
 
-__all__ = ['User', 'Role', 'Project', 'Feature', 'CustomFunction', 'FileUpload', 'BackgroundTask', 'ApiRequestLog']
+__all__ = ['User', 'Role', 'Project', 'Feature', 'CustomFunction', 'FileUpload', 'BackgroundTask', 'ApiRequestLog', 'ApiUsageDaily', 'ApiUsageHourly']
@@ -0,0 +1,44 @@
+from app import db
+
+
+class ApiUsageDaily(db.Model):
+    """
+    Request counts per project, feature and day, maintained alongside ApiRequestLog
+    so usage charts never scan raw logs. feature_id 0 means the request matched no feature.
+    """
+    __tablename__ = 'api_usage_daily'
+    __table_args__ = (db.UniqueConstraint('project_id', 'feature_id', 'day', name='uq_api_usage_daily_bucket'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    feature_id = db.Column(db.Integer, nullable=False, default=0)
+    day = db.Column(db.Date, nullable=False)
+    request_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'project_id': self.project_id,
+            'feature_id': self.feature_id or None,
+            'day': self.day.isoformat(),
+            'count': self.request_count
+        }
+
+
+class ApiUsageHourly(db.Model):
+    """Same counters at hour granularity; `hour` is truncated to the start of the hour (UTC)"""
+    __tablename__ = 'api_usage_hourly'
+    __table_args__ = (db.UniqueConstraint('project_id', 'feature_id', 'hour', name='uq_api_usage_hourly_bucket'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    project_id = db.Column(db.Integer, db.ForeignKey('projects.id', ondelete='CASCADE'), nullable=False)
+    feature_id = db.Column(db.Integer, nullable=False, default=0)
+    hour = db.Column(db.DateTime, nullable=False)
+    request_count = db.Column(db.Integer, nullable=False, default=0)
+
+    def to_dict(self):
+        return {
+            'project_id': self.project_id,
+            'feature_id': self.feature_id or None,
+            'hour': self.hour.isoformat(),
+            'count': self.request_count
+        }
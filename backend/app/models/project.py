@@ -11,7 +11,10 @@ class Project(db.Model):
     owner_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     status = db.Column(db.String(50), default='draft')  # draft, active, archived
     generation_mode = db.Column(db.String(50), default='manual')  # manual, ai, mixed
+    generation_target = db.Column(db.String(20), default='flask')  # flask, asgi
     api_key = db.Column(db.String(255), unique=True)
+    sync_hashes = db.Column(db.JSON, default={})  # content hash per file at the last sync-from-files
+    test_data_ttl_days = db.Column(db.Integer, nullable=True)  # wizard test record TTL, NULL = TEST_RECORD_TTL_DAYS, 0 = keep
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -28,6 +31,8 @@ class Project(db.Model):
             'owner_id': self.owner_id,
             'status': self.status,
             'generation_mode': self.generation_mode,
+            'generation_target': self.generation_target,
+            'test_data_ttl_days': self.test_data_ttl_days,
             'api_key': self.api_key,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
@@ -1,5 +1,49 @@
 from app import db
 from datetime import datetime
+from sqlalchemy import String, literal_column
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+class json_text(FunctionElement):
+    """
+    Text value of a top-level JSON key, e.g. json_text(TestRecord.data, 'email'). The key is
+    rendered inline so filters compile to exactly the expression the indexes below are built on.
+    """
+    type = String()
+    inherit_cache = True
+    name = 'json_text'
+
+    def __init__(self, column, key):
+        if not key.isidentifier():
+            raise ValueError(f"Unsupported JSON key: {key!r}")
+        super().__init__(column, literal_column(f"'{key}'"))
+
+
+def _json_text_parts(element, compiler, **kw):
+    column, key = element.clauses
+    return compiler.process(column, **kw), key.name.strip("'")
+
+
+@compiles(json_text)
+def _json_text_default(element, compiler, **kw):
+    column, key = _json_text_parts(element, compiler, **kw)
+    return f"JSON_VALUE({column}, '$.{key}')"
+
+
+@compiles(json_text, 'postgresql')
+def _json_text_postgresql(element, compiler, **kw):
+    column, key = _json_text_parts(element, compiler, **kw)
+    return f"({column} ->> '{key}')"
+
+
+@compiles(json_text, 'sqlite')
+def _json_text_sqlite(element, compiler, **kw):
+    # json_extract keeps numbers numeric; the cast makes 3 and '3' compare the same as on PostgreSQL
+    column, key = _json_text_parts(element, compiler, **kw)
+    return f"CAST(json_extract({column}, '$.{key}') AS TEXT)"
+
 
 class TestRecord(db.Model):
     """
@@ -9,10 +53,10 @@ class TestRecord(db.Model):
     __tablename__ = 'test_records'
 
     id = db.Column(db.Integer, primary_key=True)
-    project_id = db.Column(db.String(36), nullable=False, index=True) # ID of the project in the wizard
-    feature_id = db.Column(db.String(36), nullable=False, index=True) # Using UUID string for feature_id from frontend
-    data = db.Column(db.JSON, nullable=False)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    project_id = db.Column(db.String(36), nullable=False) # ID of the project in the wizard
+    feature_id = db.Column(db.String(36), nullable=False) # Using UUID string for feature_id from frontend
+    data = db.Column(db.JSON().with_variant(JSONB(), 'postgresql'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
 
     def to_dict(self):
         return {
@@ -21,3 +65,25 @@ class TestRecord(db.Model):
             'data': self.data,
             'created_at': self.created_at.isoformat()
         }
+
+
+# Every handler query is scoped to (project_id, feature_id); record id lookups within a scope
+# go through an expression index instead of scanning the JSON
+db.Index('ix_test_records_scope', TestRecord.project_id, TestRecord.feature_id)
+db.Index('ix_test_records_scope_record_id', TestRecord.project_id, TestRecord.feature_id, json_text(TestRecord.data, 'id'))
+
+# Auth test users: identity fields are unique per scope, so duplicate registrations are rejected
+# by the database even when they race. Partial indexes only serve queries that repeat the
+# predicate, hence AUTH_SCOPE is shared with the handler's filters.
+AUTH_FEATURE_PREFIX = 'auth_test_'
+# The pattern is inlined rather than bound: planners only match a partial index against an
+# identical literal predicate
+AUTH_SCOPE = TestRecord.feature_id.like(literal_column(f"'{AUTH_FEATURE_PREFIX}%'"))
+AUTH_IDENTITY_FIELDS = ('email', 'username')
+
+for _field in AUTH_IDENTITY_FIELDS:
+    db.Index(
+        f'uq_test_records_auth_{_field}',
+        TestRecord.project_id, TestRecord.feature_id, json_text(TestRecord.data, _field),
+        unique=True, postgresql_where=AUTH_SCOPE, sqlite_where=AUTH_SCOPE
+    )
@@ -1,6 +1,6 @@
 from app import db
 from datetime import datetime
-import bcrypt
+from app.services.password_service import password_hasher
 
 class User(db.Model):
     """User model for authentication"""
@@ -21,11 +21,11 @@ class User(db.Model):
     
     def set_password(self, password):
         """Hash and set password"""
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        self.password_hash = password_hasher.hash(password)
     
     def check_password(self, password):
         """Verify password"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        return password_hasher.verify(password, self.password_hash)
     
     def to_dict(self):
         return {
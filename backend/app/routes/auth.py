@@ -1,5 +1,5 @@
 from flask import Blueprint, request, jsonify
-from app.utils.decorators import token_required, handle_exceptions
+from app.utils.decorators import token_required, role_required, handle_exceptions
 from app.utils.validators import UserRegisterSchema, UserLoginSchema
 from app.services.auth_service import AuthService
 from flask_jwt_extended import get_jwt_identity
@@ -81,3 +81,11 @@ def change_password():
         data.get('new_password')
     )
     return jsonify(result), status
+
+@auth_bp.route('/metrics/password-hashing', methods=['GET'])
+@role_required(['admin'])
+@handle_exceptions
+def password_hashing_metrics():
+    """bcrypt work factors, pool size and hash/verify latency - MANUAL"""
+    from app.services.password_service import password_hasher
+    return jsonify(password_hasher.metrics()), 200
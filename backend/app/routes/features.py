@@ -1,4 +1,5 @@
 from flask import Blueprint, request, jsonify
+from datetime import datetime
 from flask_jwt_extended import get_jwt_identity
 from app import db
 from app.utils.decorators import token_required, handle_exceptions, apikey_required
@@ -216,17 +217,21 @@ def external_proxy_gateway(subpath, project_context=None):
     
     # Log the external request
     from app.models.api_request_log import ApiRequestLog
+    from app.services.usage_service import UsageService
     try:
         log = ApiRequestLog(
             project_id=project_context.id,
             feature_id=target_feature.id,
             method=method,
             path=subpath,
-            status_code=status_code
+            status_code=status_code,
+            created_at=datetime.utcnow()
         )
         db.session.add(log)
+        UsageService.record(log)
         db.session.commit()
     except Exception as e:
+        db.session.rollback()
         print(f"Error logging external request: {str(e)}")
         
     return jsonify(response_data), status_code
@@ -20,7 +20,8 @@ def create_project():
             user_id,
             schema.name,
             schema.description,
-            schema.generation_mode
+            schema.generation_mode,
+            schema.generation_target
         )
         return jsonify(result), status
     except Exception as e:
@@ -34,8 +35,10 @@ def list_projects():
     user_id = get_jwt_identity()
     limit = request.args.get('limit', 50, type=int)
     offset = request.args.get('offset', 0, type=int)
+    cursor = request.args.get('cursor')
+    with_total = request.args.get('total', 'true').lower() != 'false'
     
-    result, status = ProjectService.get_user_projects(user_id, limit, offset)
+    result, status = ProjectService.get_user_projects(user_id, limit, offset, cursor, with_total)
     return jsonify(result), status
 
 @projects_bp.route('/stats', methods=['GET'])
@@ -69,7 +72,9 @@ def update_project(project_id):
         user_id,
         data.get('name'),
         data.get('description'),
-        data.get('status')
+        data.get('status'),
+        data.get('generation_target'),
+        data.get('test_data_ttl_days')
     )
     return jsonify(result), status
 
@@ -91,28 +96,17 @@ def regenerate_project_key(project_id):
     result, status = ProjectService.regenerate_api_key(project_id, user_id)
     return jsonify(result), status
 
-def _format_features_for_generator(features):
-    """Helper to unify feature structure for GeneratorService"""
-    formatted = []
-    for f in features:
-        if isinstance(f, dict):
-            cfg = f.get('config') or f.get('configuration') or {}
-            formatted.append({
-                'name': f.get('name'),
-                'type': f.get('type') or f.get('feature_type'),
-                'config': cfg,
-                'configuration': cfg
-            })
-        else:
-            # Assuming it's a model-like object with attributes
-            cfg = getattr(f, 'configuration', {}) or getattr(f, 'config', {})
-            formatted.append({
-                'name': getattr(f, 'name', 'Unknown'),
-                'type': getattr(f, 'feature_type', 'CRUD'),
-                'config': cfg,
-                'configuration': cfg
-            })
-    return formatted
+@projects_bp.route('/<int:project_id>/usage', methods=['GET'])
+@token_required
+@handle_exceptions
+def get_project_usage(project_id):
+    """External API usage series from the rollup tables - MANUAL"""
+    from app.services.usage_service import UsageService
+    user_id = get_jwt_identity()
+    granularity = request.args.get('granularity', 'day')
+    days = min(request.args.get('days', 14, type=int), 365)
+    result, status = UsageService.get_project_usage(project_id, user_id, granularity, days)
+    return jsonify(result), status
 
 @projects_bp.route('/download', methods=['POST'])
 def download_project_code():
@@ -125,29 +119,89 @@ def download_project_code():
             
         project_info = data.get('projectInfo', {})
         features = data.get('features', [])
+        compression = data.get('compression') or request.args.get('compression', 'default')
         
         from app.services.generator_service import GeneratorService
-        from flask import send_file
+        from flask import Response, stream_with_context
         
-        # Format features correctly
-        formatted_features = _format_features_for_generator(features)
+        if compression not in GeneratorService.COMPRESSION_LEVELS:
+            return jsonify({
+                'error': f"Invalid compression '{compression}'",
+                'allowed': list(GeneratorService.COMPRESSION_LEVELS)
+            }), 400
         
-        # Generate the zip file in memory
-        memory_file = GeneratorService.generate_project(project_info, formatted_features)
+        target = (project_info.get('options') or {}).get('target', 'flask')
+        if target not in GeneratorService.TARGETS:
+            return jsonify({
+                'error': f"Invalid target '{target}'",
+                'allowed': list(GeneratorService.TARGETS)
+            }), 400
+        
+        # Format features correctly
+        formatted_features = GeneratorService.format_features(features)
         
         filename = f"{project_info.get('name', 'project').lower().replace(' ', '_')}.zip"
         
-        return send_file(
-            memory_file,
+        # Render up front so generator errors still surface as a JSON 500; only the zip
+        # encoding is streamed, one compressed file at a time
+        files = list(GeneratorService.iter_project_files(project_info, formatted_features))
+        return Response(
+            stream_with_context(GeneratorService.stream_zip(files, compression)),
             mimetype='application/zip',
-            as_attachment=True,
-            download_name=filename
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
         )
     except Exception as e:
         print(f"Generation error: {e}")
         traceback.print_exc()
         return jsonify({'error': str(e), 'trace': traceback.format_exc()}), 500
 
+@projects_bp.route('/bulk-export', methods=['POST'])
+@token_required
+@handle_exceptions
+def bulk_export_projects():
+    """Export several projects as one streamed archive"""
+    from flask import Response, stream_with_context
+    from app.services.generator_service import GeneratorService
+    from app.services.export_service import ExportService
+    
+    user_id = get_jwt_identity()
+    data = request.get_json() or {}
+    project_ids = data.get('project_ids') or []
+    compression = data.get('compression', 'default')
+    
+    if not isinstance(project_ids, list) or not project_ids:
+        return jsonify({'error': 'project_ids must be a non-empty list'}), 400
+    if compression not in GeneratorService.COMPRESSION_LEVELS:
+        return jsonify({
+            'error': f"Invalid compression '{compression}'",
+            'allowed': list(GeneratorService.COMPRESSION_LEVELS)
+        }), 400
+    
+    options = data.get('options') or {}
+    if not isinstance(options, dict):
+        return jsonify({'error': 'options must be an object'}), 400
+    target = options.get('target', 'flask')
+    if target not in GeneratorService.TARGETS:
+        return jsonify({
+            'error': f"Invalid target '{target}'",
+            'allowed': list(GeneratorService.TARGETS)
+        }), 400
+    
+    exports = ExportService.load_exports(project_ids, user_id, options)
+    if not exports:
+        return jsonify({'error': 'No matching projects found'}), 404
+    
+    # Rendered in-process: forking a process pool per request from a threaded server multiplies
+    # workers under concurrent exports. The pool is kept for the export-projects CLI command.
+    return Response(
+        stream_with_context(ExportService.stream_archive(exports, compression, workers=1)),
+        mimetype='application/zip',
+        headers={
+            'Content-Disposition': 'attachment; filename="projects_export.zip"',
+            'X-Export-Count': str(len(exports))
+        }
+    )
+
 @projects_bp.route('/preview', methods=['POST'])
 def preview_project_code():
     """Generate and return project code as JSON for preview"""
@@ -162,7 +216,7 @@ def preview_project_code():
         from app.services.generator_service import GeneratorService
         
         # Format features correctly
-        formatted_features = _format_features_for_generator(features)
+        formatted_features = GeneratorService.format_features(features)
 
         files = GeneratorService.get_project_files(project_info, formatted_features)
         
@@ -26,10 +26,12 @@ class AIService:
             {
                 "table": "table_name_lowercase",
                 "fields": [
-                    { "name": "field_name", "type": "string|integer|boolean|datetime|float", "required": true|false }
-                ]
+                    { "name": "field_name", "type": "string|integer|boolean|datetime|float", "required": true|false, "indexed": true|false, "unique": true|false }
+                ],
+                "indexes": [ { "fields": ["field_a", "field_b"], "unique": true|false } ]
             }
             Rule 3: Always include an 'id' field as integer primary key if not specified.
+            Rule 4: Only set "indexed"/"unique" or add "indexes" for fields that are looked up or must not repeat; "indexes" is optional.
             """
         elif feature_type == 'FUNCTIONS':
             system_prompt = """You are a Backend Engineer creating simple, testable Custom Functions.
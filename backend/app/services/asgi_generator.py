@@ -0,0 +1,549 @@
+from app.services.generator_service import GeneratorService
+
+
+class AsgiGenerator:
+    """
+    ASGI variant of the generated project: Quart with async SQLAlchemy sessions.
+    Selected with projectInfo.options.target = "asgi". Models, custom function
+    modules, bench/ and project metadata are shared with the Flask output.
+    """
+
+    @staticmethod
+    def iter_project_files(project_info, features):
+        production = GeneratorService._is_production(project_info)
+        has_auth = GeneratorService._has_auth(features)
+        yield 'requirements.txt', AsgiGenerator._generate_requirements(features, project_info)
+        yield 'run.py', AsgiGenerator._generate_run_py()
+        yield '.env.example', GeneratorService._generate_env(project_info, features)
+        yield 'README.md', GeneratorService._generate_readme(project_info)
+        yield '.gitignore', GeneratorService._get_gitignore()
+        yield 'app/__init__.py', AsgiGenerator._generate_app_init(project_info)
+        yield 'app/config.py', GeneratorService._generate_config(features, project_info)
+        yield 'app/database.py', AsgiGenerator._generate_database()
+
+        if production:
+            yield 'gunicorn.conf.py', GeneratorService._generate_gunicorn_conf('asgi')
+            yield 'Dockerfile', GeneratorService._generate_dockerfile()
+            yield '.dockerignore', GeneratorService._get_dockerignore()
+        yield 'app/models/__init__.py', GeneratorService._generate_models_init(features)
+        yield 'app/models/crud.py', GeneratorService._generate_crud_models(features)
+        yield 'app/routes/__init__.py', GeneratorService._generate_routes_init(features).replace(
+            'from flask import Blueprint', 'from quart import Blueprint')
+        yield 'app/routes/crud.py', AsgiGenerator._generate_crud_routes(features)
+        yield 'app/routes/functions.py', AsgiGenerator._generate_function_routes(features)
+
+        functions = list(GeneratorService._get_function_modules(features))
+        if functions:
+            yield 'app/functions/__init__.py', GeneratorService._generate_functions_init(features)
+            for fn_name, config, module in functions:
+                yield f'app/functions/{module}.py', GeneratorService._generate_function_module(config, 'asgi')
+
+        if GeneratorService._has_cache(features):
+            yield 'app/cache.py', GeneratorService._generate_cache_module(features, 'asgi')
+
+        if GeneratorService._has_instrumentation(project_info):
+            yield 'app/metrics.py', GeneratorService._generate_metrics_module('asgi')
+
+        if GeneratorService._has_fast_json(project_info):
+            yield 'app/json_provider.py', GeneratorService._generate_json_provider('asgi')
+
+        if has_auth:
+            yield 'app/security.py', AsgiGenerator._generate_security()
+            yield 'app/models/user.py', GeneratorService._generate_user_model(features)
+            yield 'app/routes/auth.py', AsgiGenerator._generate_auth_routes(features)
+
+        if GeneratorService._has_analytics(features):
+            yield 'app/routes/analytics.py', GeneratorService._generate_analytics_routes(features, 'asgi')
+
+        yield 'bench/__init__.py', '"""Load-test harness: python -m bench.run --help"""\n'
+        yield 'bench/scenarios.py', GeneratorService._generate_bench_scenarios(features)
+        yield 'bench/run.py', GeneratorService._generate_bench_runner()
+
+    @staticmethod
+    def _generate_requirements(features, project_info=None):
+        reqs = """Quart==0.19.4
+quart-cors==0.7.0
+SQLAlchemy[asyncio]==2.0.25
+aiosqlite==0.19.0
+asyncpg==0.29.0
+python-dotenv==1.0.0
+uvicorn==0.27.0
+"""
+        if GeneratorService._has_auth(features):
+            reqs += "PyJWT==2.8.0\nbcrypt==4.1.2\n"
+        if GeneratorService._has_cache(features):
+            reqs += "redis==5.0.1\n"
+        if GeneratorService._is_production(project_info):
+            reqs += "gunicorn==21.2.0\n"
+        if GeneratorService._has_fast_json(project_info):
+            reqs += "orjson==3.9.10\n"
+        return reqs
+
+    @staticmethod
+    def _generate_run_py():
+        return """import asyncio
+import os
+from app import create_app, db
+
+app = create_app()
+
+
+async def init_db():
+    await db.create_all()
+    await db.engine.dispose()
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    asyncio.run(init_db())
+    uvicorn.run(app, host='127.0.0.1', port=int(os.environ.get('PORT', 5000)))
+"""
+
+    @staticmethod
+    def _generate_app_init(project_info=None):
+        fast_json = GeneratorService._has_fast_json(project_info)
+        code = """from quart import Quart
+from quart_cors import cors
+from app.config import Config
+from app.database import Database
+"""
+        if fast_json:
+            code += "from app.json_provider import FastJSONProvider\n"
+        code += """
+db = Database()
+
+
+def create_app(config_class=Config):
+    app = Quart(__name__)
+"""
+        if fast_json:
+            code += "    app.json = FastJSONProvider(app)\n"
+        code += """    app.config.from_object(config_class)
+
+    db.init_app(app)
+    app = cors(app)
+"""
+        if GeneratorService._has_instrumentation(project_info):
+            code += "\n    from app.metrics import init_metrics\n    init_metrics(app)\n"
+        code += """
+    from app.routes import api_bp
+    app.register_blueprint(api_bp)
+
+    return app
+"""
+        return code
+
+    @staticmethod
+    def _generate_database():
+        return """\"\"\"
+Async SQLAlchemy engine and sessions.
+
+`db` also exposes the Flask-SQLAlchemy style names the models are written with
+(db.Model, db.Column, db.String, db.Index, ...), so models match the Flask output.
+Routes open a session per request with `async with db.session() as session`.
+\"\"\"
+import sqlalchemy
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Model(DeclarativeBase):
+    pass
+
+
+ASYNC_DRIVERS = {
+    'sqlite://': 'sqlite+aiosqlite://',
+    'postgres://': 'postgresql+asyncpg://',
+    'postgresql://': 'postgresql+asyncpg://',
+}
+
+
+def async_url(url):
+    \"\"\"Swap the default sync driver of a database URL for its asyncio counterpart\"\"\"
+    for prefix, replacement in ASYNC_DRIVERS.items():
+        if url.startswith(prefix):
+            return replacement + url[len(prefix):]
+    return url
+
+
+class Database:
+    Model = Model
+
+    def __init__(self):
+        self.engine = None
+        self.session = None
+
+    def __getattr__(self, name):
+        # db.Column, db.Integer, db.ForeignKey, ... resolve to SQLAlchemy's own names
+        return getattr(sqlalchemy, name)
+
+    def init_app(self, app):
+        self.engine = create_async_engine(
+            async_url(app.config['SQLALCHEMY_DATABASE_URI']),
+            **app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {})
+        )
+        self.session = async_sessionmaker(self.engine, expire_on_commit=False)
+
+        @app.after_serving
+        async def dispose_engine():
+            await self.engine.dispose()
+
+    async def create_all(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Model.metadata.create_all)
+
+    async def drop_all(self):
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Model.metadata.drop_all)
+"""
+
+    @staticmethod
+    def _generate_security():
+        return """\"\"\"
+JWT access tokens for the async app, mirroring the Flask-JWT-Extended API used by
+the Flask target: create_access_token, @jwt_required() and get_jwt_identity().
+\"\"\"
+import time
+from functools import wraps
+import jwt
+from quart import current_app, g, jsonify, request
+
+
+def create_access_token(identity):
+    now = int(time.time())
+    expires_in = int(current_app.config.get('JWT_ACCESS_TOKEN_EXPIRES', 900))
+    payload = {'sub': str(identity), 'iat': now, 'nbf': now, 'exp': now + expires_in, 'type': 'access'}
+    return jwt.encode(payload, current_app.config['JWT_SECRET_KEY'], algorithm='HS256')
+
+
+def jwt_required():
+    def decorator(f):
+        @wraps(f)
+        async def wrapper(*args, **kwargs):
+            header = request.headers.get('Authorization', '')
+            if not header.startswith('Bearer '):
+                return jsonify({'msg': 'Missing Authorization Header'}), 401
+            try:
+                claims = jwt.decode(header[len('Bearer '):], current_app.config['JWT_SECRET_KEY'], algorithms=['HS256'])
+            except jwt.ExpiredSignatureError:
+                return jsonify({'msg': 'Token has expired'}), 401
+            except jwt.InvalidTokenError as e:
+                return jsonify({'msg': str(e)}), 422
+            g.jwt_identity = claims['sub']
+            return await f(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_jwt_identity():
+    return g.get('jwt_identity')
+
+
+def current_user_id():
+    \"\"\"Identity as an integer, for comparisons against owner_id columns\"\"\"
+    identity = get_jwt_identity()
+    return int(identity) if identity is not None else None
+"""
+
+    @staticmethod
+    def _generate_auth_routes(features):
+        auth_feature = GeneratorService._get_auth_feature(features)
+        config = auth_feature.get('config') or auth_feature.get('configuration') or {}
+        extra_fields = config.get('extra_fields', [])
+        has_username = any((f if isinstance(f, str) else f.get('name')) == 'username' for f in extra_fields)
+
+        code = """import asyncio
+import bcrypt
+from quart import request, jsonify
+from sqlalchemy import or_, select
+from app import db
+from app.models.user import User
+from app.routes import api_bp
+from app.security import create_access_token, jwt_required, current_user_id
+
+# bcrypt is CPU-bound; it runs in a worker thread so the event loop keeps serving requests
+
+
+@api_bp.route('/auth/register', methods=['POST'])
+async def register():
+    data = await request.get_json()
+    async with db.session() as session:
+        if await session.scalar(select(User.id).filter_by(email=data.get('email'))):
+            return jsonify({'error': 'Email already exists'}), 400
+"""
+        if has_username:
+            code += """        if await session.scalar(select(User.id).filter_by(username=data.get('username'))):
+            return jsonify({'error': 'Username already exists'}), 400
+"""
+        code += """
+        hashed = await asyncio.to_thread(bcrypt.hashpw, data.get('password').encode('utf-8'), bcrypt.gensalt())
+        user = User(email=data.get('email'), password_hash=hashed.decode('utf-8'))
+"""
+        processed_register = []
+        for field in extra_fields:
+            fname = field if isinstance(field, str) else field.get('name')
+            if fname and fname not in ['email', 'password', 'id'] and fname not in processed_register:
+                processed_register.append(fname)
+                code += f"        if '{fname}' in data: user.{fname} = data['{fname}']\n"
+
+        code += """
+        session.add(user)
+        await session.commit()
+        return jsonify(user.to_dict()), 201
+
+
+@api_bp.route('/auth/login', methods=['POST'])
+async def login():
+    data = await request.get_json()
+    async with db.session() as session:
+"""
+        if has_username:
+            code += """        # Support login by email or username
+        user = await session.scalar(select(User).where(or_(User.email == data.get('email'), User.username == data.get('username'))))
+"""
+        else:
+            code += "        user = await session.scalar(select(User).filter_by(email=data.get('email')))\n"
+
+        code += """    if user and await asyncio.to_thread(bcrypt.checkpw, data.get('password').encode('utf-8'), user.password_hash.encode('utf-8')):
+        token = create_access_token(identity=user.id)
+        return jsonify({'token': token, 'user': user.to_dict()})
+    return jsonify({'error': 'Invalid credentials'}), 401
+
+
+@api_bp.route('/auth/me', methods=['GET'])
+@jwt_required()
+async def me():
+    async with db.session() as session:
+        user = await session.get(User, current_user_id())
+    return jsonify(user.to_dict())
+"""
+        return code
+
+    @staticmethod
+    def _generate_crud_routes(features):
+        has_auth = GeneratorService._has_auth(features)
+        has_cache = GeneratorService._has_cache(features)
+        code = "from quart import request, jsonify, abort\nfrom datetime import datetime\nfrom sqlalchemy import select, insert, delete\nfrom sqlalchemy.exc import IntegrityError\nfrom sqlalchemy.orm import load_only\nfrom app import db\nfrom app.models import *\nfrom app.routes import api_bp\n"
+        if has_auth:
+            code += "from app.security import jwt_required, current_user_id\n"
+        if has_cache:
+            code += "from app.cache import cached, invalidate\n"
+
+        code += AsgiGenerator._generate_pagination_helpers()
+        code += AsgiGenerator._generate_bulk_helpers()
+        code += "\n@api_bp.route('/', methods=['GET'])\nasync def index():\n    return jsonify({'status': 'ok', 'message': 'API is running'})\n\n"
+
+        for feature in features:
+            original_name = feature.get('name', 'Unknown')
+            f_type = str(feature.get('type') or feature.get('feature_type') or original_name).upper()
+
+            if f_type in ['CRUD', 'DATABASE', 'RESOURCE']:
+                config = feature.get('config') or feature.get('configuration') or {}
+                table_name = config.get('table', original_name.lower())
+                class_name = table_name.capitalize()
+                slug = table_name
+                cache_ttl = GeneratorService._get_cache_ttl(config)
+                owner_filter = ", owner_id=current_user_id()" if has_auth else ""
+
+                # GET List
+                code += f"# Routes for {class_name}\n"
+                code += f"@api_bp.route('/{slug}', methods=['GET'])\n"
+                if has_auth: code += "@jwt_required()\n"
+                if cache_ttl: code += f"@cached('{slug}', ttl={cache_ttl})\n"
+                code += f"async def get_{slug}():\n"
+                page_size = int(config.get('page_size', GeneratorService.DEFAULT_PAGE_SIZE))
+                max_page_size = int(config.get('max_page_size', GeneratorService.MAX_PAGE_SIZE))
+                if has_auth: code += f"    stmt = select({class_name}).filter_by(owner_id=current_user_id())\n"
+                else: code += f"    stmt = select({class_name})\n"
+                code += "    async with db.session() as session:\n"
+                code += f"        return jsonify(await paginate(session, stmt, {class_name}, {min(page_size, max_page_size)}, {max_page_size}))\n\n"
+
+                # GET Single
+                code += f"@api_bp.route('/{slug}/<int:id>', methods=['GET'])\n"
+                if has_auth: code += "@jwt_required()\n"
+                if cache_ttl: code += f"@cached('{slug}', ttl={cache_ttl})\n"
+                code += f"async def get_{slug}_item(id):\n"
+                code += "    async with db.session() as session:\n"
+                code += f"        item = await session.scalar(select({class_name}).filter_by(id=id{owner_filter}))\n"
+                code += "    if item is None:\n        abort(404)\n"
+                code += "    return jsonify(item.to_dict())\n\n"
+
+                # POST
+                code += f"@api_bp.route('/{slug}', methods=['POST'])\n"
+                if has_auth: code += "@jwt_required()\n"
+                code += f"async def create_{slug}():\n"
+                code += "    data = await request.get_json()\n"
+                code += f"    new_item = {class_name}()\n"
+                if has_auth: code += "    new_item.owner_id = current_user_id()\n"
+
+                fields = config.get('fields', [])
+                for field in fields:
+                    fname = field['name']
+                    if fname == 'id': continue
+                    if field['type'] == 'datetime': continue
+                    code += f"    if '{fname}' in data: new_item.{fname} = data['{fname}']\n"
+
+                code += "    async with db.session() as session:\n"
+                code += "        session.add(new_item)\n        await session.commit()\n"
+                if has_cache: code += f"    await invalidate('{slug}')\n"
+                code += "    return jsonify(new_item.to_dict()), 201\n\n"
+
+                # DELETE
+                code += f"@api_bp.route('/{slug}/<int:id>', methods=['DELETE'])\n"
+                if has_auth: code += "@jwt_required()\n"
+                code += f"async def delete_{slug}(id):\n"
+                code += "    async with db.session() as session:\n"
+                code += f"        item = await session.scalar(select({class_name}).filter_by(id=id{owner_filter}))\n"
+                code += "        if item is None:\n            abort(404)\n"
+                code += "        await session.delete(item)\n        await session.commit()\n"
+                if has_cache: code += f"    await invalidate('{slug}')\n"
+                code += "    return '', 204\n\n"
+
+                code += AsgiGenerator._generate_bulk_routes(slug, class_name, config, has_auth, has_cache)
+        return code
+
+    @staticmethod
+    def _generate_bulk_routes(slug, class_name, config, has_auth, has_cache):
+        """POST/DELETE /<slug>/bulk: one multi-row statement per request in a single transaction"""
+        max_batch = int(config.get('max_batch_size', GeneratorService.MAX_BULK_SIZE))
+        columns = [f['name'] for f in config.get('fields', []) if f['name'] != 'id' and f['type'] != 'datetime']
+        required = [f['name'] for f in config.get('fields', []) if f['name'] in columns and f.get('required')]
+
+        # Bulk POST
+        code = f"@api_bp.route('/{slug}/bulk', methods=['POST'])\n"
+        if has_auth: code += "@jwt_required()\n"
+        code += f"async def bulk_create_{slug}():\n"
+        code += f"    items, error = await bulk_payload('items', {max_batch})\n"
+        code += "    if error:\n        return error\n"
+        code += f"    columns = {columns!r}\n"
+        code += f"    required = {required!r}\n"
+        code += "    rows = []\n"
+        code += "    for index, data in enumerate(items):\n"
+        code += "        if not isinstance(data, dict):\n"
+        code += "            return jsonify({'error': 'Each item must be an object', 'index': index}), 400\n"
+        code += "        missing = [f for f in required if f not in data]\n"
+        code += "        if missing:\n"
+        code += "            return jsonify({'error': f\"Missing required fields: {', '.join(missing)}\", 'index': index}), 400\n"
+        code += "        row = {f: data.get(f) for f in columns}\n"
+        if has_auth: code += "        row['owner_id'] = current_user_id()\n"
+        code += "        rows.append(row)\n"
+        code += "    async with db.session() as session:\n"
+        code += "        try:\n"
+        code += f"            ids = (await session.scalars(insert({class_name}).returning({class_name}.id), rows)).all()\n"
+        code += "            await session.commit()\n"
+        code += "        except IntegrityError as e:\n"
+        code += "            await session.rollback()\n"
+        code += "            return jsonify({'error': 'Bulk insert failed', 'message': str(e.orig)}), 400\n"
+        if has_cache: code += f"    await invalidate('{slug}')\n"
+        code += "    return jsonify({'created': len(ids), 'ids': ids}), 201\n\n"
+
+        # Bulk DELETE
+        code += f"@api_bp.route('/{slug}/bulk', methods=['DELETE'])\n"
+        if has_auth: code += "@jwt_required()\n"
+        code += f"async def bulk_delete_{slug}():\n"
+        code += f"    ids, error = await bulk_payload('ids', {max_batch})\n"
+        code += "    if error:\n        return error\n"
+        code += "    if not all(isinstance(i, int) for i in ids):\n"
+        code += "        return jsonify({'error': 'ids must be integers'}), 400\n"
+        code += f"    stmt = delete({class_name}).where({class_name}.id.in_(ids))\n"
+        if has_auth: code += f"    stmt = stmt.where({class_name}.owner_id == current_user_id())\n"
+        code += "    async with db.session() as session:\n"
+        code += "        result = await session.execute(stmt.execution_options(synchronize_session=False))\n"
+        code += "        await session.commit()\n"
+        if has_cache: code += f"    await invalidate('{slug}')\n"
+        code += "    return jsonify({'deleted': result.rowcount})\n\n"
+        return code
+
+    @staticmethod
+    def _generate_bulk_helpers():
+        return """async def bulk_payload(key, max_size):
+    \"\"\"Read a non-empty array from the body (bare or under `key`), capped at max_size\"\"\"
+    data = await request.get_json(silent=True)
+    if isinstance(data, dict):
+        data = data.get(key)
+    if not isinstance(data, list) or not data:
+        return None, (jsonify({'error': f'Expected a non-empty array of {key}'}), 400)
+    if len(data) > max_size:
+        return None, (jsonify({'error': f'Batch too large: {len(data)} > {max_size}'}), 413)
+    return data, None
+
+"""
+
+    @staticmethod
+    def _generate_pagination_helpers():
+        return """
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def paginate(session, stmt, model, default_limit, max_limit):
+    \"\"\"
+    Keyset (?cursor=<last id>) or offset (?offset=N) pagination ordered by id.
+    ?limit is capped at max_limit and ?fields=a,b projects the selected columns.
+    has_more is computed by fetching one extra row instead of a COUNT query.
+    \"\"\"
+    limit = request.args.get('limit', default_limit, type=int) or default_limit
+    limit = max(1, min(limit, max_limit))
+    cursor = request.args.get('cursor', type=int)
+
+    if cursor is not None:
+        stmt = stmt.where(model.id > cursor).order_by(model.id)
+    else:
+        stmt = stmt.order_by(model.id).offset(max(0, request.args.get('offset', 0, type=int)))
+
+    fields = None
+    requested = request.args.get('fields')
+    if requested:
+        columns = model.__table__.columns.keys()
+        fields = ['id'] + [f for f in requested.split(',') if f in columns and f != 'id']
+        stmt = stmt.options(load_only(*[getattr(model, f) for f in fields]))
+
+    rows = (await session.scalars(stmt.limit(limit + 1))).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if fields:
+        items = [{f: _serialize(getattr(row, f)) for f in fields} for row in rows]
+    else:
+        items = [row.to_dict() for row in rows]
+
+    return {
+        'items': items,
+        'limit': limit,
+        'has_more': has_more,
+        'next_cursor': rows[-1].id if has_more else None
+    }
+
+"""
+
+    @staticmethod
+    def _generate_function_routes(features):
+        functions = list(GeneratorService._get_function_modules(features))
+        code = "import asyncio\nimport inspect\nfrom quart import Response, request, jsonify\nfrom app.routes import api_bp\n"
+        for _, _, module in functions:
+            code += f"from app.functions.{module} import handler as {module}_handler\n"
+        code += """
+
+async def invoke(handler, input_data):
+    \"\"\"Await `async def` handlers; run plain ones in a worker thread so they cannot block the event loop\"\"\"
+    if inspect.iscoroutinefunction(handler):
+        return await handler(input_data)
+    return await asyncio.to_thread(handler, input_data)
+
+
+def respond(result):
+    \"\"\"Responses and (body, status) tuples from a handler pass through; anything else is sent as JSON\"\"\"
+    if isinstance(result, (Response, tuple)):
+        return result
+    return jsonify(result)
+
+"""
+        for fn_name, config, module in functions:
+            path = config.get('path') or f"/{fn_name}"
+            method = config.get('method') or "POST"
+
+            code += f"\n@api_bp.route('{path}', methods=['{method}'])\nasync def route_{module}():\n"
+            code += "    input_data = (await request.get_json()) if request.is_json else {}\n"
+            code += f"    return respond(await invoke({module}_handler, input_data))\n"
+        return code
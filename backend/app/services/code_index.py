@@ -0,0 +1,151 @@
+import ast
+import re
+import hashlib
+import textwrap
+
+# SQLAlchemy column type name -> feature field type
+COLUMN_TYPES = {
+    'Integer': 'integer',
+    'Boolean': 'boolean',
+    'DateTime': 'datetime',
+    'Text': 'text',
+    'Float': 'float',
+}
+
+# Statements appended by the generator after the user's function code
+GENERATED_ROUTE_TRAILER = (
+    "if 'handler' in locals()",
+    "if 'result' in locals()",
+    "return jsonify({'status': 'success'})",
+)
+
+# Body of a generated route calling a handler hoisted into app/functions/
+HOISTED_HANDLER_CALL = re.compile(
+    r"^return (?:jsonify|respond)\((?:\w+_handler\(input_data\)|await invoke\(\w+_handler, input_data\))\)$"
+)
+
+
+def content_hash(source):
+    """Stable digest of a submitted file, used to skip unchanged files on sync"""
+    return hashlib.sha256(source.encode('utf-8')).hexdigest()
+
+
+class CodeIndex:
+    """
+    Single-pass index of a generated source file.
+    Parses the file once with `ast` and records model classes with their
+    columns and `route_*` functions with any inline user code they wrap
+    (projects exported before handlers moved to app/functions/).
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self.lines = source.splitlines()
+        self.classes = {}
+        self.routes = {}
+
+        self._tree = ast.parse(source)
+        for node in self._tree.body:
+            if isinstance(node, ast.ClassDef) and self._is_model(node):
+                self.classes[node.name] = self._class_columns(node)
+            elif isinstance(node, ast.FunctionDef) and node.name.startswith('route_'):
+                self.routes[node.name[len('route_'):]] = self._route_code(node)
+
+    def function_code(self):
+        """
+        User code held by a generated app/functions/<name>.py module.
+        Wrapped legacy snippets are unwrapped back to the original snippet.
+        """
+        from app.services.generator_service import GeneratorService
+
+        source = self.source
+        for imports in GeneratorService.FUNCTION_MODULE_IMPORTS.values():
+            if source.startswith(imports):
+                source = source[len(imports):].lstrip('\n')
+                break
+        if not source.startswith(GeneratorService.LEGACY_HANDLER_MARKER):
+            return source.strip()
+
+        handler = next((n for n in ast.parse(source).body if isinstance(n, ast.FunctionDef) and n.name == 'handler'), None)
+        if handler is None:
+            return source.strip()
+        lines = source.splitlines()
+
+        # Drop the generated `result = {...}` default and trailing `return result`
+        body = handler.body
+        start_line = body[0].end_lineno if len(body) > 1 else handler.lineno
+        if isinstance(body[-1], ast.Return) and len(body) > 1:
+            body = body[:-1]
+        if len(body) <= 1:
+            return ''
+        snippet = '\n'.join(lines[start_line:body[-1].end_lineno])
+        return textwrap.dedent(snippet).strip()
+
+    def find_class(self, *candidates):
+        """Return the columns of the first class matching any candidate name (case-insensitive)"""
+        wanted = {c.lower().replace(' ', '') for c in candidates if c}
+        for name, columns in self.classes.items():
+            if name.lower() in wanted:
+                return columns
+        return None
+
+    @staticmethod
+    def _is_model(node):
+        return any(isinstance(base, ast.Attribute) and base.attr == 'Model' for base in node.bases)
+
+    @staticmethod
+    def _is_column_call(value):
+        return (isinstance(value, ast.Call) and isinstance(value.func, ast.Attribute)
+                and value.func.attr == 'Column')
+
+    def _class_columns(self, node):
+        columns = []
+        for stmt in node.body:
+            if not isinstance(stmt, ast.Assign) or len(stmt.targets) != 1:
+                continue
+            target = stmt.targets[0]
+            if not isinstance(target, ast.Name) or not self._is_column_call(stmt.value):
+                continue
+
+            call = stmt.value
+            col_type = 'string'
+            if call.args:
+                type_node = call.args[0]
+                if isinstance(type_node, ast.Call):
+                    type_node = type_node.func
+                if isinstance(type_node, ast.Attribute):
+                    col_type = COLUMN_TYPES.get(type_node.attr, 'string')
+
+            kwargs = {}
+            for kw in call.keywords:
+                if kw.arg and isinstance(kw.value, ast.Constant):
+                    kwargs[kw.arg] = kw.value.value
+
+            columns.append({
+                'name': target.id,
+                'type': col_type,
+                'required': kwargs.get('nullable') is False,
+                'kwargs': kwargs,
+            })
+        return columns
+
+    def _route_code(self, node):
+        """Extract the user code pasted after the `input_data = ...` line of a generated route"""
+        body = list(node.body)
+        if body and isinstance(body[0], ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == 'input_data' for t in body[0].targets):
+            start_line = body[0].end_lineno
+            body = body[1:]
+        else:
+            start_line = node.body[0].lineno - 1
+
+        while body:
+            segment = ast.get_source_segment(self.source, body[-1])
+            if not (segment.startswith(GENERATED_ROUTE_TRAILER) or HOISTED_HANDLER_CALL.match(segment)):
+                break
+            body.pop()
+        if not body:
+            return ''
+
+        snippet = '\n'.join(self.lines[start_line:body[-1].end_lineno])
+        return textwrap.dedent(snippet).strip()
@@ -0,0 +1,153 @@
+import os
+import json
+import logging
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from app.models import Project, Feature, CustomFunction
+from app.services.generator_service import GeneratorService
+
+logger = logging.getLogger(__name__)
+
+
+def _render_project_zip(project_info, features, compression):
+    """Process pool worker: renders one project into zip bytes"""
+    return b''.join(GeneratorService.stream_project(project_info, features, compression))
+
+
+def _log_progress(done, total, export, error=None):
+    if error:
+        logger.error(f"Bulk export {done}/{total}: project {export['id']} failed: {error}")
+    else:
+        logger.info(f"Bulk export {done}/{total}: project {export['id']} rendered")
+
+
+class ExportService:
+    """Bulk multi-project export service"""
+
+    @staticmethod
+    def load_exports(project_ids, user_id=None, options=None):
+        """
+        Loads projects with their features and functions, formatted for GeneratorService the same
+        way as single-project downloads. `options` (profile, instrumentation, fast_json, target)
+        apply to every project; the target defaults to each project's generation_target.
+        Uses one query per table regardless of how many projects are exported.
+        """
+        query = Project.query.filter(Project.id.in_(project_ids), Project.status != 'deleted')
+        if user_id is not None:
+            query = query.filter(Project.owner_id == int(user_id))
+        projects = query.order_by(Project.id).all()
+        if not projects:
+            return []
+
+        found_ids = [p.id for p in projects]
+        features_by_project = defaultdict(list)
+
+        for f in Feature.query.filter(Feature.project_id.in_(found_ids)).order_by(Feature.id).all():
+            if f.is_enabled is not False:
+                features_by_project[f.project_id].append(f)
+
+        for fn in CustomFunction.query.filter(CustomFunction.project_id.in_(found_ids)).order_by(CustomFunction.id).all():
+            if fn.is_active is False:
+                continue
+            features_by_project[fn.project_id].append({
+                'name': fn.name,
+                'type': 'FUNCTIONS',
+                'config': {
+                    'name': fn.name.lower().replace(' ', '_'),
+                    'code': fn.function_code,
+                    'endpoint_path': fn.endpoint_path,
+                    'http_method': fn.http_method
+                }
+            })
+
+        exports = []
+        for p in projects:
+            slug = (p.name or 'project').lower().replace(' ', '_')
+            exports.append({
+                'id': p.id,
+                'filename': f"{slug}_{p.id}.zip",
+                'project_info': {
+                    'name': p.name,
+                    'description': p.description,
+                    'options': {'target': p.generation_target or 'flask', **(options or {})}
+                },
+                'features': GeneratorService.format_features(features_by_project[p.id])
+            })
+        return exports
+
+    @staticmethod
+    def iter_rendered(exports, compression='default', workers=None, progress=_log_progress):
+        """
+        Renders each export to zip bytes, yielding (export, data, error) as projects complete.
+        Projects are rendered across a process pool unless only one worker is requested.
+        """
+        total = len(exports)
+
+        if workers == 1 or total <= 1:
+            for done, export in enumerate(exports, 1):
+                try:
+                    data, error = _render_project_zip(export['project_info'], export['features'], compression), None
+                except Exception as e:
+                    data, error = None, str(e)
+                if progress:
+                    progress(done, total, export, error)
+                yield export, data, error
+            return
+
+        with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, total)) as pool:
+            futures = {
+                pool.submit(_render_project_zip, export['project_info'], export['features'], compression): export
+                for export in exports
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                export = futures[future]
+                try:
+                    data, error = future.result(), None
+                except Exception as e:
+                    data, error = None, str(e)
+                if progress:
+                    progress(done, total, export, error)
+                yield export, data, error
+
+    @staticmethod
+    def stream_archive(exports, compression='default', workers=None, progress=_log_progress):
+        """
+        Streams a combined archive holding one zip per project plus a manifest.json.
+        Inner zips are already compressed, so they are stored as-is.
+        """
+        if compression not in GeneratorService.COMPRESSION_LEVELS:
+            raise ValueError(f"Unknown compression '{compression}'")
+
+        def entries():
+            manifest = []
+            for export, data, error in ExportService.iter_rendered(exports, compression, workers, progress):
+                manifest.append(ExportService._manifest_entry(export, data, error))
+                if data is not None:
+                    yield export['filename'], data
+            yield 'manifest.json', json.dumps({'projects': manifest}, indent=2)
+
+        return GeneratorService.stream_zip(entries(), 'store')
+
+    @staticmethod
+    def write_directory(exports, output_dir, compression='default', workers=None, progress=_log_progress):
+        """Writes one zip per project into output_dir and returns the manifest entries"""
+        if compression not in GeneratorService.COMPRESSION_LEVELS:
+            raise ValueError(f"Unknown compression '{compression}'")
+
+        os.makedirs(output_dir, exist_ok=True)
+        manifest = []
+        for export, data, error in ExportService.iter_rendered(exports, compression, workers, progress):
+            if data is not None:
+                with open(os.path.join(output_dir, export['filename']), 'wb') as fh:
+                    fh.write(data)
+            manifest.append(ExportService._manifest_entry(export, data, error))
+        return manifest
+
+    @staticmethod
+    def _manifest_entry(export, data, error):
+        entry = {'id': export['id'], 'file': export['filename'], 'status': 'ok' if error is None else 'failed'}
+        if error is None:
+            entry['size'] = len(data)
+        else:
+            entry['error'] = error
+        return entry
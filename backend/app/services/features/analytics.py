@@ -25,6 +25,8 @@ class AnalyticsHandler(FeatureHandler):
             
         reports = schema.get('reports', [])
         results = {}
+        # Records are loaded once per entity, however many reports use it
+        records_by_entity = {}
         
         for report in reports:
             name = report.get('name', 'Report')
@@ -39,8 +41,10 @@ class AnalyticsHandler(FeatureHandler):
             crud_feature_id = f"crud_{user_id}_{entity}"
             
             # Query all records for this entity and project
-            records = TestRecord.query.filter_by(feature_id=crud_feature_id, project_id=project_id).all()
-            data_list = [r.data for r in records]
+            if entity not in records_by_entity:
+                records = TestRecord.query.filter_by(feature_id=crud_feature_id, project_id=project_id).all()
+                records_by_entity[entity] = [r.data for r in records]
+            data_list = records_by_entity[entity]
             
             if mode == 'advanced':
                 expr = report.get('expression', '').lower()
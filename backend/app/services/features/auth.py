@@ -1,18 +1,26 @@
 from .base import FeatureHandler
-from app.models.test_record import TestRecord
+from .validation import get_validator
+from app.models.test_record import TestRecord, json_text, AUTH_FEATURE_PREFIX, AUTH_SCOPE
 from app import db
-import bcrypt
+from sqlalchemy import select, union_all
+from sqlalchemy.exc import IntegrityError
+from app.services.password_service import password_hasher
 import jwt
 from datetime import datetime, timedelta
 from flask import current_app
 
+CREDENTIAL_FIELDS = [
+    {'name': 'email', 'type': 'string', 'required': True},
+    {'name': 'password', 'type': 'string', 'required': True},
+]
+
 class AuthHandler(FeatureHandler):
     """Handler for testing Authentication features in the wizard"""
     
     def handle(self, method, endpoint, body, schema, context=None):
         user_id = context.get('user_id', 'anon') if context else 'anon'
         project_id = context.get('project_id', 'default') if context else 'default'
-        feature_id = f"auth_test_{user_id}"
+        feature_id = f"{AUTH_FEATURE_PREFIX}{user_id}"
         clean_endpoint = endpoint.strip('/')
         
         if 'register' in clean_endpoint:
@@ -35,49 +43,32 @@ class AuthHandler(FeatureHandler):
         if not email or not password:
             return {'error': 'Email and password are required'}, 400
             
-        # Strict Validation: Check allowed fields
+        # Strict Validation: unexpected fields, missing required extras, then types
         extra_fields_config = schema.get('extra_fields', []) if schema else []
-        extra_field_names = []
-        for f in extra_fields_config:
-            fname = f if isinstance(f, str) else f.get('name')
-            if fname: extra_field_names.append(fname)
-            
-        allowed_fields = ['email', 'password'] + extra_field_names
-        
-        # 1. Check for extra fields
-        extra_keys = [k for k in body.keys() if k not in allowed_fields]
-        if extra_keys:
+        validator = get_validator(CREDENTIAL_FIELDS + list(extra_fields_config))
+        body, error = validator.validate(body)
+        if error:
             return {
                 'status': 400,
-                'message': f"Unexpected fields: {', '.join(extra_keys)}"
+                'message': error
             }, 400
+        extra_field_names = validator.fields[len(CREDENTIAL_FIELDS):]
 
-        # 2. Check for missing required extra fields
-        required_extras = []
-        for f in extra_fields_config:
-            if isinstance(f, dict) and f.get('required') and f.get('name'):
-                required_extras.append(f.get('name'))
-                
-        missing_extras = [f for f in required_extras if f not in body]
-        if missing_extras:
-            return {
-                'status': 400,
-                'message': f"Missing required fields: {', '.join(missing_extras)}"
-            }, 400
-
-        records = TestRecord.query.filter_by(feature_id=feature_id, project_id=project_id).all()
         has_username = 'username' in extra_field_names
         
-        for r in records:
-            if r.data.get('email') == email:
-                return {'error': 'Email already exists'}, 400
-            if has_username and r.data.get('username') == body.get('username'):
-                return {'error': 'Username already exists'}, 400
+        identity = {'email': email}
+        if has_username:
+            identity['username'] = body.get('username')
+        
+        conflict = self._conflicting_field(feature_id, project_id, identity)
+        if conflict:
+            return {'error': f'{conflict.capitalize()} already exists'}, 400
+        user_count = TestRecord.query.filter_by(feature_id=feature_id, project_id=project_id).count()
         
-        pw_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        pw_hash = password_hasher.hash_test(password)
         
         user_data = {
-            'id': len(records) + 1,
+            'id': user_count + 1,
             'email': email,
             'password_hash': pw_hash,
             'created_at': datetime.utcnow().isoformat()
@@ -85,12 +76,18 @@ class AuthHandler(FeatureHandler):
         
         # Add validated extra fields
         for fname in extra_field_names:
-            if fname and fname not in ['email', 'password', 'id']:
+            if fname != 'id':
                 user_data[fname] = body.get(fname)
 
         record = TestRecord(feature_id=feature_id, project_id=project_id, data=user_data)
         db.session.add(record)
-        db.session.commit()
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent registration won the race for the unique identity index
+            db.session.rollback()
+            conflict = self._conflicting_field(feature_id, project_id, identity) or 'email'
+            return {'error': f'{conflict.capitalize()} already exists'}, 400
         
         resp_data = user_data.copy()
         resp_data.pop('password_hash')
@@ -107,22 +104,17 @@ class AuthHandler(FeatureHandler):
         if not email or not password:
             return {'error': 'Email and password are required'}, 400
             
-        records = TestRecord.query.filter_by(feature_id=feature_id, project_id=project_id).all()
         extra_fields_config = schema.get('extra_fields', []) if schema else []
         has_username = any((f if isinstance(f, str) else f.get('name')) == 'username' for f in extra_fields_config)
         
-        user_record = None
-        for r in records:
-            # Check email
-            if r.data.get('email') == body.get('email'):
-                user_record = r
-                break
-            # Or check username if supported
-            if has_username and r.data.get('username') == body.get('username'):
-                user_record = r
-                break
+        # Check email, or username if supported; an email match wins
+        identity = {'email': email}
+        if has_username:
+            identity['username'] = body.get('username')
+        matches = self._find_users(feature_id, project_id, identity)
+        user_record = next((r for r in matches if r.data.get('email') == email), matches[0] if matches else None)
                 
-        if not user_record or not bcrypt.checkpw(password.encode('utf-8'), user_record.data.get('password_hash').encode('utf-8')):
+        if not user_record or not password_hasher.verify(password, user_record.data.get('password_hash')):
             return {'error': 'Invalid credentials'}, 401
             
         # Generate a mock token
@@ -154,3 +146,32 @@ class AuthHandler(FeatureHandler):
         return {
             'user': user_data
         }, 200
+
+    @staticmethod
+    def _find_users(feature_id, project_id, identity):
+        """
+        Test users matching any of the identity fields. One statement, with a UNION ALL branch
+        per field so each branch is a probe of its unique auth index.
+        """
+        probes = [
+            select(TestRecord.id).where(
+                TestRecord.project_id == project_id,
+                TestRecord.feature_id == feature_id,
+                AUTH_SCOPE,
+                json_text(TestRecord.data, field) == str(value)
+            )
+            for field, value in identity.items() if value is not None
+        ]
+        if not probes:
+            return []
+        ids = probes[0] if len(probes) == 1 else union_all(*probes)
+        return TestRecord.query.filter(TestRecord.id.in_(ids)).all()
+
+    @classmethod
+    def _conflicting_field(cls, feature_id, project_id, identity):
+        """First identity field already taken in this scope, or None"""
+        records = cls._find_users(feature_id, project_id, identity)
+        for field, value in identity.items():
+            if value is not None and any(str(r.data.get(field)) == str(value) for r in records):
+                return field
+        return None
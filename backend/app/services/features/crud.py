@@ -1,5 +1,6 @@
 from .base import FeatureHandler
-from app.models.test_record import TestRecord
+from .validation import get_validator
+from app.models.test_record import TestRecord, json_text
 from app import db
 import uuid
 
@@ -30,31 +31,29 @@ class CRUDHandler(FeatureHandler):
                 'message': f"Endpoint '{endpoint}' does not match table '{table_name}'"
             }, 404
 
+        validator = get_validator(schema.get('fields', []) if schema else [], {'id': 'integer'})
+
         if method == 'GET':
-            # Query valid test records for this feature and project
-            records = TestRecord.query.filter_by(feature_id=feature_id, project_id=project_id).all()
-            
-            # Strict Output Filtering
-            allowed_fields = [f['name'] for f in schema.get('fields', [])] + ['id']
-            cleaned_items = []
-            for record in records:
-                cleaned = {k: v for k, v in record.data.items() if k in allowed_fields}
-                cleaned_items.append(cleaned)
-            
-            # If endpoint looks like /item/1, filter by ID (simplistic)
+            # If endpoint looks like /item/1, fetch that record through the id index
             parts = endpoint.split('/')
             if parts and parts[-1].isdigit():
                  target_id = int(parts[-1])
-                 found = next((item for item in cleaned_items if item.get('id') == target_id), None)
-                 if found:
+                 record = self._find_record(feature_id, project_id, target_id)
+                 if record:
                      return {
                         'status': 200, 
-                        'data': found,
+                        'data': validator.filter(record.data),
                         'message': f'Record {target_id} retrieved'
                     }, 200
                  else:
                      return {'error': 'Not found'}, 404
 
+            # Query valid test records for this feature and project
+            records = TestRecord.query.filter_by(feature_id=feature_id, project_id=project_id).all()
+            
+            # Strict Output Filtering
+            cleaned_items = [validator.filter(record.data) for record in records]
+
             return {
                 'status': 200, 
                 'data': {'items': cleaned_items, 'count': len(cleaned_items)},
@@ -62,24 +61,12 @@ class CRUDHandler(FeatureHandler):
             }, 200
             
         elif method == 'POST':
-            fields_config = schema.get('fields', [])
-            allowed_fields = [f['name'] for f in fields_config]
-            required_fields = [f['name'] for f in fields_config if f.get('required')]
-            
-            # 1. Check for extra fields
-            extra_fields = [k for k in body.keys() if k not in allowed_fields and k != 'id']
-            if extra_fields:
-                 return {
-                    'status': 400,
-                    'message': f"Unexpected fields: {', '.join(extra_fields)}"
-                }, 400
-
-            # 2. Check for missing required fields
-            missing_fields = [f for f in required_fields if f not in body]
-            if missing_fields:
+            # Unexpected fields, missing required fields, then types
+            body, error = validator.validate(body)
+            if error:
                  return {
                     'status': 400,
-                    'message': f"Missing required fields: {', '.join(missing_fields)}"
+                    'message': error
                 }, 400
             
             # Simulate ID generation
@@ -102,26 +89,16 @@ class CRUDHandler(FeatureHandler):
             }, 201
             
         elif method == 'PUT':
-             fields_config = schema.get('fields', [])
-             allowed_fields = [f['name'] for f in fields_config]
-             
-             # Check for extra fields
-             extra_fields = [k for k in body.keys() if k not in allowed_fields and k != 'id']
-             if extra_fields:
+             body, error = validator.validate(body, partial=True)
+             if error:
                  return {
                     'status': 400,
-                    'message': f"Unexpected fields: {', '.join(extra_fields)}"
+                    'message': error
                 }, 400
 
              target_id = body.get('id')
              if target_id:
-                 records = TestRecord.query.filter_by(feature_id=feature_id, project_id=project_id).all()
-                 target_record = None
-                 for r in records:
-                     if r.data.get('id') == target_id:
-                         target_record = r
-                         break
-                 
+                 target_record = self._find_record(feature_id, project_id, target_id)
                  if target_record:
                      target_record.data = body
                      db.session.commit()
@@ -138,16 +115,24 @@ class CRUDHandler(FeatureHandler):
              parts = endpoint.split('/')
              if parts and parts[-1].isdigit():
                  target_id = int(parts[-1])
-                 records = TestRecord.query.filter_by(feature_id=feature_id, project_id=project_id).all()
-                 for r in records:
-                     if r.data.get('id') == target_id:
-                         db.session.delete(r)
-                         db.session.commit()
-                         return {
-                            'status': 204, 
-                            'data': {}, 
-                            'message': f'Resource {target_id} deleted'
-                         }, 200
+                 record = self._find_record(feature_id, project_id, target_id)
+                 if record:
+                     db.session.delete(record)
+                     db.session.commit()
+                     return {
+                        'status': 204, 
+                        'data': {}, 
+                        'message': f'Resource {target_id} deleted'
+                     }, 200
              return {'error': 'Resource not found'}, 404
 
         return {'error': 'Method not supported'}, 400
+
+    @staticmethod
+    def _find_record(feature_id, project_id, record_id):
+        """Single indexed lookup on (project_id, feature_id, data->>'id')"""
+        return TestRecord.query.filter(
+            TestRecord.project_id == project_id,
+            TestRecord.feature_id == feature_id,
+            json_text(TestRecord.data, 'id') == str(record_id)
+        ).first()
@@ -0,0 +1,116 @@
+"""
+Request validators for the wizard test handlers. A feature's field config is compiled once
+into a pydantic model plus frozen name sets, and cached under a hash of the config.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Optional
+
+from pydantic import ConfigDict, Field, ValidationError, create_model
+
+FIELD_TYPES = {
+    'string': str,
+    'text': str,
+    'integer': int,
+    'float': float,
+    'boolean': bool,
+    'datetime': datetime,
+}
+
+# Least recently used validators are evicted past this many configs
+_MAX_VALIDATORS = 512
+_validators = OrderedDict()
+_validators_lock = threading.Lock()
+
+
+def _normalize(fields):
+    """Accepts dict entries and bare names (auth extra_fields); first definition of a name wins"""
+    normalized = {}
+    for f in fields or []:
+        entry = {'name': f} if isinstance(f, str) else f
+        name = entry.get('name') if isinstance(entry, dict) else None
+        if name and name not in normalized:
+            normalized[name] = entry
+    return list(normalized.values())
+
+
+class CompiledValidator:
+    """Set-based field checks followed by type coercion through a generated model"""
+
+    def __init__(self, fields, reserved=None):
+        fields = _normalize(fields)
+        reserved = {k: v for k, v in (reserved or {}).items() if k not in {f['name'] for f in fields}}
+
+        self.fields = tuple(f['name'] for f in fields)
+        self.allowed = frozenset(self.fields) | frozenset(reserved)
+        self.required = tuple(f['name'] for f in fields if f.get('required'))
+        self.types = {f['name']: f.get('type') for f in fields}
+        self.types.update(reserved)
+
+        self.model = self._build_model(partial=False)
+        self.partial_model = self._build_model(partial=True)
+
+    def _build_model(self, partial):
+        # Attribute names are positional so that any field name (spaces, 'json', 'model_config')
+        # is safe; the real name travels as the alias. Defaults are not validated, so a required
+        # field stays non-nullable in the partial model.
+        definitions = {}
+        for i, (name, ftype) in enumerate(self.types.items()):
+            py_type = FIELD_TYPES.get(ftype, Any)
+            if name not in self.required:
+                definitions[f'f{i}'] = (Optional[py_type], Field(default=None, alias=name))
+            elif partial:
+                definitions[f'f{i}'] = (py_type, Field(default=None, alias=name))
+            else:
+                definitions[f'f{i}'] = (py_type, Field(alias=name))
+        return create_model('CompiledFields', __config__=ConfigDict(extra='ignore'), **definitions)
+
+    def validate(self, body, partial=False):
+        """Return (data, error): coerced JSON-safe data holding only the keys sent, or a message"""
+        extra = [k for k in body if k not in self.allowed]
+        if extra:
+            return None, f"Unexpected fields: {', '.join(extra)}"
+
+        if not partial:
+            missing = [f for f in self.required if f not in body]
+            if missing:
+                return None, f"Missing required fields: {', '.join(missing)}"
+
+        try:
+            instance = (self.partial_model if partial else self.model).model_validate(body)
+        except ValidationError as e:
+            invalid = []
+            for err in e.errors():
+                name = str(err['loc'][0]) if err['loc'] else ''
+                label = f"{name} (expected {self.types.get(name) or 'value'})"
+                if label not in invalid:
+                    invalid.append(label)
+            return None, f"Invalid field types: {', '.join(invalid)}"
+
+        return instance.model_dump(mode='json', by_alias=True, exclude_unset=True), None
+
+    def filter(self, data):
+        """Drop keys a stored record may carry that are no longer part of the config"""
+        return {k: v for k, v in data.items() if k in self.allowed}
+
+
+def get_validator(fields, reserved=None):
+    """Compiled validator for a field config; `reserved` maps extra accepted names to a type"""
+    canonical = json.dumps([fields or [], reserved or {}], sort_keys=True, default=str)
+    key = hashlib.sha1(canonical.encode('utf-8')).hexdigest()
+    with _validators_lock:
+        validator = _validators.get(key)
+        if validator is not None:
+            _validators.move_to_end(key)
+            return validator
+
+    validator = CompiledValidator(fields, reserved)
+    with _validators_lock:
+        _validators[key] = validator
+        _validators.move_to_end(key)
+        while len(_validators) > _MAX_VALIDATORS:
+            _validators.popitem(last=False)
+    return validator
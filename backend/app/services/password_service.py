@@ -0,0 +1,106 @@
+"""
+Password hashing for platform users and wizard test users. bcrypt releases the GIL, so hashes
+run on a small bounded pool: threaded workers overlap them without oversubscribing the CPU.
+The work factor is configured per environment (BCRYPT_ROUNDS, BCRYPT_TEST_ROUNDS).
+"""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+DEFAULT_ROUNDS = 12
+
+
+class _Latency:
+    """Running count/total/max plus a window of recent samples for percentiles"""
+
+    def __init__(self, window=512):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=window)
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def to_dict(self):
+        ordered = sorted(self.recent)
+
+        def percentile(p):
+            return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 2) if ordered else None
+
+        return {
+            'count': self.count,
+            'avg_ms': round(self.total / self.count * 1000, 2) if self.count else None,
+            'p50_ms': percentile(50),
+            'p95_ms': percentile(95),
+            'max_ms': round(self.max * 1000, 2),
+        }
+
+
+class PasswordHasher:
+    """bcrypt behind a bounded executor, with latency metrics per operation"""
+
+    def __init__(self, rounds=DEFAULT_ROUNDS, test_rounds=DEFAULT_ROUNDS, max_workers=4):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._latency = {'hash': _Latency(), 'verify': _Latency()}
+        self.configure(rounds, test_rounds, max_workers)
+
+    def configure(self, rounds, test_rounds, max_workers):
+        with self._lock:
+            self.rounds = rounds
+            self.test_rounds = test_rounds
+            if self._executor is None or max_workers != self.max_workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='bcrypt')
+            self.max_workers = max_workers
+
+    def init_app(self, app):
+        self.configure(
+            app.config.get('BCRYPT_ROUNDS', DEFAULT_ROUNDS),
+            app.config.get('BCRYPT_TEST_ROUNDS', DEFAULT_ROUNDS),
+            app.config.get('BCRYPT_MAX_WORKERS', 4)
+        )
+
+    def hash(self, password, rounds=None):
+        """bcrypt hash of `password` as str, at `rounds` or the configured work factor"""
+        salt = bcrypt.gensalt(rounds or self.rounds)
+        return self._run('hash', bcrypt.hashpw, password.encode('utf-8'), salt).decode('utf-8')
+
+    def hash_test(self, password):
+        """Hash for wizard test users, at the (cheaper) test work factor"""
+        return self.hash(password, self.test_rounds)
+
+    def verify(self, password, hashed):
+        """Check `password` against a stored hash; the cost is whatever the hash was made with"""
+        if not password or not hashed:
+            return False
+        return self._run('verify', bcrypt.checkpw, password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'rounds': self.rounds,
+                'test_rounds': self.test_rounds,
+                'max_workers': self.max_workers,
+                **{op: latency.to_dict() for op, latency in self._latency.items()}
+            }
+
+    def _run(self, op, fn, *args):
+        started = time.perf_counter()
+        try:
+            return self._executor.submit(fn, *args).result()
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._latency[op].add(elapsed)
+
+
+password_hasher = PasswordHasher()
@@ -1,9 +1,12 @@
 from app import db
 from app.models import Project
+import base64
+import binascii
 import secrets
 from datetime import datetime, timedelta
 import logging
 from sqlalchemy.orm.attributes import flag_modified
+from app.services.code_index import CodeIndex, content_hash
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +14,7 @@ class ProjectService:
     """Project management service"""
     
     @staticmethod
-    def create_project(user_id, name, description, generation_mode):
+    def create_project(user_id, name, description, generation_mode, generation_target='flask'):
         """Create new project - MANUAL"""
         api_key = secrets.token_urlsafe(32)
         
@@ -20,6 +23,7 @@ class ProjectService:
             description=description,
             owner_id=user_id,
             generation_mode=generation_mode,
+            generation_target=generation_target,
             api_key=api_key
         )
         
@@ -29,22 +33,72 @@ class ProjectService:
         return {'project': project.to_dict()}, 201
     
     @staticmethod
-    def get_user_projects(user_id, limit=50, offset=0):
-        """Get all projects for a user - MANUAL"""
-        projects = Project.query.filter_by(owner_id=user_id).filter(Project.status != 'deleted').order_by(Project.updated_at.desc()).limit(limit).offset(offset).all()
-        total = Project.query.filter_by(owner_id=user_id).filter(Project.status != 'deleted').count()
-        
+    def get_user_projects(user_id, limit=50, offset=0, cursor=None, with_total=True):
+        """Get all projects for a user - MANUAL (keyset pagination on (updated_at, id) via `cursor`)"""
+        from app.models import Feature, CustomFunction
+        from sqlalchemy import func, select, and_, or_
+        from sqlalchemy.orm import aliased
+
+        try:
+            after = _decode_cursor(cursor) if cursor else None
+        except ValueError:
+            return {'error': 'Invalid cursor'}, 400
+
+        # Feature and function counts come from grouped subqueries limited to this user's projects
+        owned = select(Project.id).where(Project.owner_id == user_id)
+
+        def grouped_count(model):
+            return select(model.project_id, func.count().label('n')).where(
+                model.project_id.in_(owned)
+            ).group_by(model.project_id).subquery()
+
+        features, functions = grouped_count(Feature), grouped_count(CustomFunction)
+        columns = [Project, (func.coalesce(features.c.n, 0) + func.coalesce(functions.c.n, 0)).label('feature_count')]
+        if with_total:
+            # Computed before the keyset filter so it stays the overall total on every page
+            columns.append(func.count().over().label('total'))
+        listing = select(*columns).outerjoin(features, features.c.project_id == Project.id).outerjoin(
+            functions, functions.c.project_id == Project.id
+        ).where(Project.owner_id == user_id, Project.status != 'deleted').subquery()
+
+        project = aliased(Project, listing)
+        query = select(project, listing.c.feature_count, *([listing.c.total] if with_total else [])).order_by(
+            project.updated_at.desc(), project.id.desc()
+        ).limit(limit + 1)
+        if after:
+            updated_at, last_id = after
+            query = query.where(or_(
+                project.updated_at < updated_at,
+                and_(project.updated_at == updated_at, project.id < last_id)
+            ))
+        elif offset:
+            query = query.offset(offset)
+
+        rows = db.session.execute(query).all()
+        page = rows[:limit]
+
         project_list = []
-        for p in projects:
-            p_dict = p.to_dict()
-            p_dict['featureCount'] = p.features.count() + p.functions.count()
+        for row in page:
+            p_dict = row[0].to_dict()
+            p_dict['featureCount'] = row.feature_count
             project_list.append(p_dict)
-            
+
+        total = None
+        if with_total:
+            if page:
+                total = page[0].total
+            elif after or offset:
+                # Past the end the window has no rows to ride on
+                total = Project.query.filter_by(owner_id=user_id).filter(Project.status != 'deleted').count()
+            else:
+                total = 0
+
         return {
             'projects': project_list,
             'total': total,
             'limit': limit,
-            'offset': offset
+            'offset': offset,
+            'nextCursor': _encode_cursor(page[-1][0]) if len(rows) > limit else None
         }, 200
     
     @staticmethod
@@ -61,7 +115,8 @@ class ProjectService:
         return {'project': project.to_dict()}, 200
     
     @staticmethod
-    def update_project(project_id, user_id, name=None, description=None, status=None):
+    def update_project(project_id, user_id, name=None, description=None, status=None, generation_target=None,
+                       test_data_ttl_days=None):
         """Update project - MANUAL"""
         project = Project.query.get(project_id)
         
@@ -77,6 +132,15 @@ class ProjectService:
             project.description = description
         if status:
             project.status = status
+        if generation_target:
+            from app.services.generator_service import GeneratorService
+            if generation_target not in GeneratorService.TARGETS:
+                return {'error': f"Unknown generation target '{generation_target}'"}, 400
+            project.generation_target = generation_target
+        if test_data_ttl_days is not None:
+            if not isinstance(test_data_ttl_days, int) or isinstance(test_data_ttl_days, bool) or test_data_ttl_days < 0:
+                return {'error': 'test_data_ttl_days must be a non-negative integer'}, 400
+            project.test_data_ttl_days = test_data_ttl_days
         
         db.session.commit()
         return {'project': project.to_dict()}, 200
@@ -96,6 +160,10 @@ class ProjectService:
         project.status = 'deleted'
         db.session.commit()
         
+        # Wizard test data is useless once the project is gone
+        from app.services.retention_service import RetentionService
+        RetentionService.purge_project_test_records(project.id)
+        
         return {'message': 'Project deleted'}, 200
 
     @staticmethod
@@ -117,86 +185,23 @@ class ProjectService:
         
     @staticmethod
     def get_user_stats(user_id):
-        """Get project statistics for user - MANUAL"""
-        from app.models import Project, Feature, CustomFunction
-        
-        # Project counts
-        total_projects = Project.query.filter_by(owner_id=user_id).count()
-        completed_projects = Project.query.filter_by(owner_id=user_id, status='completed').count()
-        draft_projects = Project.query.filter_by(owner_id=user_id, status='draft').count()
-        deleted_projects = Project.query.filter_by(owner_id=user_id, status='deleted').count()
-        
-        # Feature counts details
-        crud_count = Feature.query.join(Project).filter(Project.owner_id == user_id, Feature.feature_type == 'CRUD').count()
-        auth_count = Feature.query.join(Project).filter(Project.owner_id == user_id, Feature.feature_type == 'AUTH').count()
-        # Functions are stored in CustomFunction table
-        function_count = CustomFunction.query.join(Project).filter(Project.owner_id == user_id).count() 
-        # Analytics or others if any
-        analytics_count = Feature.query.join(Project).filter(Project.owner_id == user_id, Feature.feature_type == 'ANALYTICS').count()
-
-        # Update totals logic to be consistent
-        total_features = Feature.query.join(Project).filter(Project.owner_id == user_id).count()
-        
-        # Estimate API endpoints
-        total_apis = (total_features * 5) + function_count
+        """Get project statistics for user - MANUAL (snapshot cached, see stats_cache)"""
+        from flask import current_app
+        from app.services.stats_cache import stats_cache
 
-        # Count Test Records (Internal - wizard)
-        from app.models.test_record import TestRecord
-        user_project_ids = [str(p.id) for p in Project.query.filter_by(owner_id=user_id).all()]
-        total_tests = TestRecord.query.filter(TestRecord.project_id.in_(user_project_ids)).count() if user_project_ids else 0
-        
-        # External API Usage Metrics
-        from app.models.api_request_log import ApiRequestLog
-        from sqlalchemy import func
-        
-        real_project_ids = [p.id for p in Project.query.filter_by(owner_id=user_id).all()]
-        total_external_tests = ApiRequestLog.query.filter(ApiRequestLog.project_id.in_(real_project_ids)).count() if real_project_ids else 0
-        
-        # API Usage by Day (Last 14 days)
-        fourteen_days_ago = datetime.utcnow() - timedelta(days=14)
-        daily_usage = db.session.query(
-            func.date(ApiRequestLog.created_at).label('date'),
-            func.count(ApiRequestLog.id).label('count')
-        ).filter(
-            ApiRequestLog.project_id.in_(real_project_ids),
-            ApiRequestLog.created_at >= fourteen_days_ago
-        ).group_by(func.date(ApiRequestLog.created_at)).all() if real_project_ids else []
-        
-        api_usage_by_day = [{'date': str(d.date), 'count': d.count} for d in daily_usage]
-        
-        # API Usage by Feature
-        feature_usage = db.session.query(
-            Feature.name,
-            func.count(ApiRequestLog.id).label('count')
-        ).join(ApiRequestLog, ApiRequestLog.feature_id == Feature.id).filter(
-            ApiRequestLog.project_id.in_(real_project_ids)
-        ).group_by(Feature.name).all() if real_project_ids else []
-        
-        api_usage_by_feature = {f.name: f.count for f in feature_usage}
+        ttl = current_app.config.get('STATS_CACHE_TTL', 0)
+        snapshot = stats_cache.get(user_id, ttl) if ttl else None
+        if snapshot is None:
+            project_ids, snapshot = _compute_user_stats(user_id)
+            if ttl:
+                stats_cache.set(user_id, project_ids, snapshot)
+        return snapshot, 200
 
-        return {
-            'totalProjects': total_projects,
-            'completedProjects': completed_projects,
-            'draftProjects': draft_projects,
-            'deletedProjects': deleted_projects,
-            'totalFeatures': total_features + function_count,
-            'totalApis': total_apis,
-            'totalTests': total_tests,
-            'totalExternalTests': total_external_tests,
-            'apiUsageByDay': api_usage_by_day,
-            'apiUsageByFeature': api_usage_by_feature,
-            'featuresByType': {
-                'CRUD': crud_count,
-                'Auth': auth_count,
-                'Functions': function_count,
-                'Analytics': analytics_count
-            }
-        }, 200
     @staticmethod
     def sync_from_files(project_id, user_id, files):
         """Sync manual code edits back to feature configurations - MANUAL"""
         from app.models import Project, Feature, CustomFunction
-        import re
+        from app.services.generator_service import GeneratorService
         
         project = Project.query.get(project_id)
         if not project:
@@ -205,245 +210,308 @@ class ProjectService:
             return {'error': 'Unauthorized'}, 403
             
         updated_features = []
-        
-        # 1. Sync Functions Logic from app/routes/functions.py
-        functions_file = files.get('app/routes/functions.py')
-        if functions_file:
+        skipped_files = []
+        errors = {}
+        
+        # Parse each submitted file once; skip files unchanged since the last sync
+        previous_hashes = project.sync_hashes or {}
+        new_hashes = dict(previous_hashes)
+        indexes = {}
+        for path, content in files.items():
+            if not content or not _is_synced_file(path):
+                continue
+            digest = content_hash(content)
+            if previous_hashes.get(path) == digest:
+                skipped_files.append(path)
+                continue
+            try:
+                indexes[path] = CodeIndex(content)
+            except SyntaxError as e:
+                errors[path] = f"Syntax error on line {e.lineno}: {e.msg}"
+                continue
+            new_hashes[path] = digest
+        
+        features = Feature.query.filter_by(project_id=project_id).all() if indexes else []
+        
+        # 1. Sync Functions Logic from app/functions/<name>.py (or inline routes in app/routes/functions.py)
+        if any(path.startswith(FUNCTION_MODULES_DIR) or path == 'app/routes/functions.py' for path in indexes):
             logger.info("Syncing functions from file...")
+            custom_functions = CustomFunction.query.filter_by(project_id=project_id).order_by(CustomFunction.id).all()
+            function_features = sorted(
+                (f for f in features if f.feature_type.upper() in FUNCTION_FEATURE_TYPES), key=lambda f: f.id
+            )
+            # Module names are deduplicated in generation order (features, then functions)
+            entities = [(feat, 'feature') for feat in function_features] + [(fn, 'name') for fn in custom_functions]
+            modules = dict(zip(
+                ((kind, entity.id) for entity, kind in entities),
+                GeneratorService.function_module_names(_function_name(entity, kind) for entity, kind in entities)
+            ))
+            
             # Sync CustomFunction table (Manual Mode)
-            custom_functions = CustomFunction.query.filter_by(project_id=project_id).all()
             for fn in custom_functions:
-                if _sync_function_logic(fn, functions_file, 'name'):
+                if _sync_function_logic(fn, indexes, 'name', modules[('name', fn.id)]):
                     updated_features.append(fn.name)
             
             # Sync Feature table (Chat/AI Mode)
-            # Function features usually have type 'FUNCTIONS' or 'FUNCTION'
-            function_features = Feature.query.filter_by(project_id=project_id).filter(
-                Feature.feature_type.in_(['FUNCTIONS', 'FUNCTION', 'CUSTOM_FUNCTION', 'AI ENDPOINTS'])
-            ).all()
-            
             for feat in function_features:
-                # Features store name in feat.name, but usually normalized in config
-                # We need to find the function name used in the route: route_{name}
-                # Generator uses: fn_name = config.get('name', original_name.lower().replace(' ', '_'))
-                if _sync_function_logic(feat, functions_file, 'feature'):
+                if _sync_function_logic(feat, indexes, 'feature', modules[('feature', feat.id)]):
                     updated_features.append(feat.name)
+                    flag_modified(feat, 'configuration')
 
         # 2. Sync CRUD Models from app/models/crud.py
-        crud_file = files.get('app/models/crud.py')
-        if crud_file:
-             logger.info("Syncing CRUD models from file...")
-             crud_features = Feature.query.filter_by(project_id=project_id).filter(
-                 Feature.feature_type.in_(['CRUD', 'DATABASE', 'RESOURCE'])
-             ).all()
-             for feat in crud_features:
-                 if _sync_crud_model_logic(feat, crud_file):
-                     updated_features.append(feat.name)
-                     flag_modified(feat, 'configuration')
+        crud_index = indexes.get('app/models/crud.py')
+        if crud_index:
+            logger.info("Syncing CRUD models from file...")
+            for feat in features:
+                if feat.feature_type.upper() in CRUD_FEATURE_TYPES and _sync_crud_model_logic(feat, crud_index):
+                    updated_features.append(feat.name)
+                    flag_modified(feat, 'configuration')
                      
         # 3. Sync Auth Model from app/models/user.py
-        user_file = files.get('app/models/user.py')
-        if user_file:
+        user_index = indexes.get('app/models/user.py')
+        if user_index:
             logger.info("Syncing Auth model from file...")
-            auth_feature = Feature.query.filter_by(project_id=project_id).filter(
-                Feature.feature_type.in_(['AUTH', 'AUTHENTICATION'])
-            ).first()
-            if auth_feature and _sync_auth_model_logic(auth_feature, user_file):
+            auth_feature = next((f for f in features if f.feature_type.upper() in AUTH_FEATURE_TYPES), None)
+            if auth_feature and _sync_auth_model_logic(auth_feature, user_index):
                 updated_features.append(auth_feature.name)
                 flag_modified(auth_feature, 'configuration')
 
+        project.sync_hashes = new_hashes
         db.session.commit()
-        logger.info(f"Sync complete. Updated features: {updated_features}")
+        logger.info(f"Sync complete. Updated features: {updated_features}, skipped unchanged files: {skipped_files}")
         
-        return {
+        result = {
             'success': True,
             'updated': updated_features,
+            'skipped': skipped_files,
             'message': f"Synchronized {len(updated_features)} features from files."
-        }, 200
+        }
+        if errors:
+            result['errors'] = errors
+        return result, 200
+
+# Generated files that can be synced back into feature configurations
+SYNCED_FILES = ('app/routes/functions.py', 'app/models/crud.py', 'app/models/user.py')
+FUNCTION_MODULES_DIR = 'app/functions/'
+FUNCTION_FEATURE_TYPES = ('FUNCTIONS', 'FUNCTION', 'CUSTOM_FUNCTION', 'AI ENDPOINTS')
+CRUD_FEATURE_TYPES = ('CRUD', 'DATABASE', 'RESOURCE')
+AUTH_FEATURE_TYPES = ('AUTH', 'AUTHENTICATION')
+
+# Field config flag -> db.Column keyword synced for CRUD models
+INDEX_FLAGS = (('unique', 'unique'), ('indexed', 'index'))
+
+def _encode_cursor(project):
+    raw = f"{project.updated_at.isoformat()}|{project.id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor):
+    """Inverse of _encode_cursor; raises ValueError for anything malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode('utf-8')
+        updated_at, project_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(updated_at), int(project_id)
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def _compute_user_stats(user_id):
+    """Dashboard numbers in five queries: ids, two conditional aggregates, two rollup groupings"""
+    from app.models import Feature, CustomFunction
+    from app.models.api_usage import ApiUsageDaily
+    from app.models.test_record import TestRecord
+    from sqlalchemy import func, case, select
+
+    project_ids = [pid for (pid,) in db.session.query(Project.id).filter(Project.owner_id == user_id)]
+
+    counts = {'completed': 0, 'draft': 0, 'deleted': 0, 'functions': 0, 'tests': 0, 'external': 0}
+    by_type = {'total': 0, 'CRUD': 0, 'AUTH': 0, 'ANALYTICS': 0}
+    api_usage_by_day, api_usage_by_feature = [], {}
+
+    if project_ids:
+        def status_count(status):
+            return func.count(case((Project.status == status, 1)))
+
+        def scalar_count(model, ids):
+            return select(func.count()).select_from(model).where(model.project_id.in_(ids)).scalar_subquery()
+
+        row = db.session.query(
+            status_count('completed'),
+            status_count('draft'),
+            status_count('deleted'),
+            scalar_count(CustomFunction, project_ids),
+            scalar_count(TestRecord, [str(pid) for pid in project_ids]),
+            select(func.coalesce(func.sum(ApiUsageDaily.request_count), 0)).where(
+                ApiUsageDaily.project_id.in_(project_ids)
+            ).scalar_subquery(),
+        ).filter(Project.owner_id == user_id).one()
+        counts = dict(zip(counts, row))
 
-def _sync_function_logic(entity, file_content, entity_type):
-    """Helper to extract and update function logic"""
-    import re
-    # Determine function name as it appears in the route
+        row = db.session.query(
+            func.count(Feature.id),
+            *[func.count(case((Feature.feature_type == t, 1))) for t in ('CRUD', 'AUTH', 'ANALYTICS')]
+        ).filter(Feature.project_id.in_(project_ids)).one()
+        by_type = dict(zip(by_type, row))
+
+        # API Usage by Day (Last 14 days), read from the daily rollup
+        fourteen_days_ago = (datetime.utcnow() - timedelta(days=14)).date()
+        daily_usage = db.session.query(
+            ApiUsageDaily.day.label('date'), func.sum(ApiUsageDaily.request_count).label('count')
+        ).filter(
+            ApiUsageDaily.project_id.in_(project_ids),
+            ApiUsageDaily.day >= fourteen_days_ago
+        ).group_by(ApiUsageDaily.day).order_by(ApiUsageDaily.day).all()
+        api_usage_by_day = [{'date': str(d.date), 'count': int(d.count)} for d in daily_usage]
+
+        # API Usage by Feature
+        feature_usage = db.session.query(Feature.name, func.sum(ApiUsageDaily.request_count).label('count')).join(
+            ApiUsageDaily, ApiUsageDaily.feature_id == Feature.id
+        ).filter(ApiUsageDaily.project_id.in_(project_ids)).group_by(Feature.name).all()
+        api_usage_by_feature = {f.name: int(f.count) for f in feature_usage}
+
+    function_count = counts['functions']
+    return project_ids, {
+        'totalProjects': len(project_ids),
+        'completedProjects': counts['completed'],
+        'draftProjects': counts['draft'],
+        'deletedProjects': counts['deleted'],
+        'totalFeatures': by_type['total'] + function_count,
+        # Estimate API endpoints
+        'totalApis': (by_type['total'] * 5) + function_count,
+        'totalTests': counts['tests'],
+        'totalExternalTests': int(counts['external']),
+        'apiUsageByDay': api_usage_by_day,
+        'apiUsageByFeature': api_usage_by_feature,
+        'featuresByType': {
+            'CRUD': by_type['CRUD'],
+            'Auth': by_type['AUTH'],
+            'Functions': function_count,
+            'Analytics': by_type['ANALYTICS']
+        }
+    }
+
+
+def _is_synced_file(path):
+    if path in SYNCED_FILES:
+        return True
+    return path.startswith(FUNCTION_MODULES_DIR) and path.endswith('.py') and not path.endswith('__init__.py')
+
+def _field_key(field, with_index_flags=False):
+    """Comparable identity of a field config entry"""
+    if isinstance(field, str):
+        field = {'name': field}
+    key = (field.get('name'), field.get('type', 'string'), bool(field.get('required', False)))
+    if with_index_flags:
+        key += tuple(bool(field.get(flag)) for flag, _ in INDEX_FLAGS)
+    return key
+
+def _merge_fields(current_fields, found_columns, with_index_flags=False):
+    """
+    Build the new field list from parsed columns, keeping any extra
+    per-field settings already present in the configuration.
+    Returns None when nothing changed.
+    """
+    current_by_name = {
+        (f if isinstance(f, str) else f.get('name')): f for f in current_fields
+    }
+    found_fields = []
+    for col in found_columns:
+        existing = current_by_name.get(col['name'])
+        field = dict(existing) if isinstance(existing, dict) else {}
+        field.update({'name': col['name'], 'type': col['type'], 'required': col['required']})
+        if with_index_flags:
+            for flag, kwarg in INDEX_FLAGS:
+                if col['kwargs'].get(kwarg):
+                    field[flag] = True
+                else:
+                    field.pop(flag, None)
+        found_fields.append(field)
+        
+    current_keys = sorted(_field_key(f, with_index_flags) for f in current_fields)
+    found_keys = sorted(_field_key(f, with_index_flags) for f in found_fields)
+    if current_keys == found_keys:
+        return None
+    return found_fields
+
+def _function_name(entity, entity_type):
+    """Function name as the generator sees it"""
     if entity_type == 'feature':
-        config = entity.configuration or {}
-        fn_name = config.get('name', entity.name.lower().replace(' ', '_'))
-    else:
-        fn_name = entity.name
-        config = entity.configuration or {}
+        return (entity.configuration or {}).get('name', entity.name.lower().replace(' ', '_'))
+    return entity.name
 
-    # Look for the function block
-    pattern = rf"def route_{fn_name}\(\):.*?\n\s+input_data = .*?\n(.*?)(?=\n@api_bp\.route|\Z)"
-    match = re.search(pattern, file_content, re.DOTALL)
-    
-    if match:
-        body = match.group(1)
-        # Unindent
-        lines = body.split('\n')
-        unindented_lines = []
-        for line in lines:
-            if line.startswith('    '):
-                unindented_lines.append(line[4:])
-            elif not line.strip():
-                unindented_lines.append('')
-            else:
-                unindented_lines.append(line)
-        
-        new_code = '\n'.join(unindented_lines).strip()
+def _sync_function_logic(entity, indexes, entity_type, module):
+    """Helper to extract and update function logic from app/functions/<module>.py"""
+    fn_name = _function_name(entity, entity_type)
+    config = dict(entity.configuration or {}) if entity_type == 'feature' else None
+
+    module_index = indexes.get(f"{FUNCTION_MODULES_DIR}{module}.py")
+    routes_index = indexes.get('app/routes/functions.py')
+    if module_index:
+        new_code = module_index.function_code()
+    elif routes_index and routes_index.routes.get(fn_name):
+        # Projects generated before per-function modules keep the code inline in the route
+        new_code = routes_index.routes[fn_name]
+    else:
+        return False
         
-        # Update config if changed
-        if config.get('code') != new_code:
-            config['code'] = new_code
-            entity.configuration = config
+    if entity_type != 'feature':
+        if entity.function_code != new_code:
+            entity.function_code = new_code
             return True
+        return False
+        
+    # Stored function features may use the backend key name
+    code_key = 'function_code' if 'function_code' in config and 'code' not in config else 'code'
+    if config.get(code_key) != new_code:
+        config[code_key] = new_code
+        entity.configuration = config
+        return True
             
     return False
 
-def _sync_crud_model_logic(feature, file_content):
+def _sync_crud_model_logic(feature, index):
     """Helper to sync CRUD model fields from code to config"""
-    import re
-    
-    config = feature.configuration or {}
+    config = dict(feature.configuration or {})
     # Determine expected class name
     table_name = config.get('table', feature.name.lower())
     class_name_expected = table_name.capitalize() # Heuristic, but consistent with generator
     
-    # 1. Find class definition
-    # Pattern: class Book(db.Model):
-    # or class Book( db.Model ):
-    class_pattern = rf"class\s+(?P<name>\w+)\s*\(\s*db\.Model\s*\):"
-    
-    # We need to find the specific class for this feature
-    # If the feature name matches the class, or table name matches
-    # We scan all classes in the file
-    
-    matches = list(re.finditer(class_pattern, file_content))
-    target_block = None
-    
-    for i, match in enumerate(matches):
-        found_class = match.group('name')
-        # Check against both class name AND table name (simple plural/singular heuristic)
-        if (found_class.upper() == class_name_expected.upper() or 
-            found_class.upper() == feature.name.upper() or
-            found_class.lower() == feature.name.lower().replace(' ', '') or 
-            found_class.lower() == config.get('table', '').lower()):
-            
-            # Found the class start
-            start_idx = match.end()
-            # Find end of this block (start of next class or end of file)
-            end_idx = matches[i+1].start() if i+1 < len(matches) else len(file_content)
-            target_block = file_content[start_idx:end_idx]
-            break
-            
-    if not target_block:
+    columns = index.find_class(class_name_expected, feature.name, config.get('table'))
+    if columns is None:
         logger.warning(f"Could not find class definition for feature: {feature.name} (Expected class: {class_name_expected})")
         return False
         
-    # 2. Parse fields from target_block
-    # Pattern: name = db.Column(db.String(120), nullable=False)
-    # We look for assignments to db.Column
-    field_pattern = r"(?P<name>\w+)\s*=\s*db\.Column\((?P<args>.*?)\)"
+    # Skip standard fields
+    found_columns = [c for c in columns if c['name'] not in ['id', 'owner_id', 'created_at', 'updated_at']]
     
-    found_fields = []
-    
-    for f_match in re.finditer(field_pattern, target_block):
-        f_name = f_match.group('name')
-        f_args = f_match.group('args')
-        
-        # Skip standard fields
-        if f_name in ['id', 'owner_id', 'created_at', 'updated_at']:
-            continue
-            
-        # Parse Type
-        f_type = 'string' # default
-        if 'db.Integer' in f_args: f_type = 'integer'
-        elif 'db.Boolean' in f_args: f_type = 'boolean'
-        elif 'db.DateTime' in f_args: f_type = 'datetime'
-        elif 'db.Text' in f_args: f_type = 'text'
-        elif 'db.Float' in f_args: f_type = 'float'
-        
-        # Parse Required
-        f_required = 'nullable=False' in f_args
-        
-        found_fields.append({
-            'name': f_name,
-            'type': f_type,
-            'required': f_required
-        })
-        
-    # 3. Compare and Update
     current_fields = config.get('fields', [])
+    found_fields = _merge_fields(current_fields, found_columns, with_index_flags=True)
     
-    import json
-    # Sort by name for reliable comparison
-    current_fields.sort(key=lambda x: x['name'])
-    found_fields.sort(key=lambda x: x['name'])
-    
-    if json.dumps(current_fields, sort_keys=True) != json.dumps(found_fields, sort_keys=True):
+    if found_fields is not None:
         logger.info(f"Updating fields for {feature.name}. Found: {len(found_fields)}, Was: {len(current_fields)}")
         config['fields'] = found_fields
         feature.configuration = config
-        from app.models import db
         # Mark as modified
         feature.updated_at = db.func.now()
         return True
         
     return False
 
-def _sync_auth_model_logic(feature, file_content):
+def _sync_auth_model_logic(feature, index):
     """Helper to sync Auth User model extra fields"""
-    import re
-    
-    config = feature.configuration or {}
+    config = dict(feature.configuration or {})
     
-    # 1. Find User class
-    class_pattern = rf"class\s+User\s*\(\s*db\.Model\s*\):"
-    match = re.search(class_pattern, file_content)
-    
-    if not match:
+    columns = index.classes.get('User')
+    if columns is None:
         return False
         
-    # Extract block
-    start_idx = match.end()
-    # Assuming User is likely the only class or first class, but let's be safe
-    # Find next class or end
-    next_class = re.search(r"class\s+\w+\s*\(", file_content[start_idx:])
-    end_idx = (start_idx + next_class.start()) if next_class else len(file_content)
-    target_block = file_content[start_idx:end_idx]
-    
-    # 2. Parse fields
-    field_pattern = r"(?P<name>\w+)\s*=\s*db\.Column\((?P<args>.*?)\)"
-    
-    found_extra_fields = []
+    # Skip Auth Core fields
+    found_columns = [c for c in columns if c['name'] not in ['id', 'email', 'password_hash', 'created_at']]
     
-    for f_match in re.finditer(field_pattern, target_block):
-        f_name = f_match.group('name')
-        f_args = f_match.group('args')
-        
-        # Skip Auth Core fields
-        if f_name in ['id', 'email', 'password_hash', 'created_at']:
-            continue
-            
-        # Parse Type
-        f_type = 'string'
-        if 'db.Integer' in f_args: f_type = 'integer'
-        elif 'db.Boolean' in f_args: f_type = 'boolean'
-        elif 'db.DateTime' in f_args: f_type = 'datetime'
-        elif 'db.Text' in f_args: f_type = 'text'
-        
-        f_required = 'nullable=False' in f_args
-        
-        found_extra_fields.append({
-            'name': f_name,
-            'type': f_type,
-            'required': f_required
-        })
-        
-    # 3. Update Config
     current_extra = config.get('extra_fields', [])
+    found_extra_fields = _merge_fields(current_extra, found_columns)
     
-    import json
-    if json.dumps(current_extra, sort_keys=True) != json.dumps(found_extra_fields, sort_keys=True):
+    if found_extra_fields is not None:
         config['extra_fields'] = found_extra_fields
         feature.configuration = config
         return True
@@ -0,0 +1,65 @@
+from app import db
+from app.models import Project
+from app.models.test_record import TestRecord
+from app.services.stats_cache import stats_cache
+from datetime import datetime, timedelta
+from sqlalchemy import delete, select
+
+
+def delete_in_batches(model, condition, batch_size=1000):
+    """Delete matching rows a chunk at a time, committing between chunks so locks stay short"""
+    total = 0
+    while True:
+        ids = db.session.scalars(select(model.id).where(condition).limit(batch_size)).all()
+        if not ids:
+            return total
+        db.session.execute(delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False))
+        db.session.commit()
+        total += len(ids)
+        if len(ids) < batch_size:
+            return total
+
+
+class RetentionService:
+    """Expiry of wizard test data (TestRecord rows written by the CRUD and Auth test handlers)"""
+
+    @staticmethod
+    def purge_test_records(default_ttl_days, batch_size=1000, now=None):
+        """
+        Delete test records older than their project's TTL (Project.test_data_ttl_days, falling
+        back to `default_ttl_days`). A TTL of 0 keeps records forever. Returns the number deleted.
+        """
+        now = now or datetime.utcnow()
+
+        overrides = {}
+        for project_id, days in db.session.query(Project.id, Project.test_data_ttl_days).filter(
+            Project.test_data_ttl_days.isnot(None)
+        ):
+            overrides.setdefault(days, []).append(str(project_id))
+
+        purged = 0
+        for days, project_ids in overrides.items():
+            if days > 0:
+                purged += delete_in_batches(TestRecord, (TestRecord.project_id.in_(project_ids)) & (
+                    TestRecord.created_at < now - timedelta(days=days)
+                ), batch_size)
+
+        if default_ttl_days and default_ttl_days > 0:
+            condition = TestRecord.created_at < now - timedelta(days=default_ttl_days)
+            overridden = [pid for ids in overrides.values() for pid in ids]
+            if overridden:
+                condition = condition & TestRecord.project_id.notin_(overridden)
+            purged += delete_in_batches(TestRecord, condition, batch_size)
+
+        if purged:
+            # Bulk deletes are invisible to the stats cache listener
+            stats_cache.clear()
+        return purged
+
+    @staticmethod
+    def purge_project_test_records(project_id, batch_size=1000):
+        """Drop every test record of a project, e.g. once it is deleted"""
+        purged = delete_in_batches(TestRecord, TestRecord.project_id == str(project_id), batch_size)
+        if purged:
+            stats_cache.invalidate(project_ids=[int(project_id)])
+        return purged
@@ -0,0 +1,98 @@
+"""
+Per-user snapshot cache for the dashboard stats. Snapshots expire after STATS_CACHE_TTL
+seconds and are dropped early when a transaction that flushed one of the user's projects,
+features, functions, test records, request logs or usage rollups commits. Bulk Core
+statements bypass the ORM listeners, so the services issuing them (retention purges, usage
+compaction) invalidate explicitly.
+"""
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class StatsCache:
+    """Snapshots keyed by user id, remembering which project ids each one covers"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, user_id, ttl):
+        key = str(user_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, _, snapshot = entry
+            if time.monotonic() - stored_at >= ttl:
+                del self._entries[key]
+                return None
+            return snapshot
+
+    def set(self, user_id, project_ids, snapshot):
+        with self._lock:
+            self._entries[str(user_id)] = (time.monotonic(), frozenset(project_ids), snapshot)
+
+    def invalidate(self, user_ids=(), project_ids=()):
+        user_ids = {str(u) for u in user_ids}
+        project_ids = set(project_ids)
+        with self._lock:
+            for key in [k for k, (_, pids, _) in self._entries.items() if k in user_ids or pids & project_ids]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+stats_cache = StatsCache()
+
+
+def _project_id(value):
+    # TestRecord keeps the project id as a string
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+_PENDING_KEY = 'stats_cache_pending'
+
+
+def _after_flush(session, flush_context):
+    from app.models import Project, Feature, CustomFunction
+    from app.models.api_request_log import ApiRequestLog
+    from app.models.api_usage import ApiUsageDaily
+    from app.models.test_record import TestRecord
+
+    user_ids, project_ids = session.info.setdefault(_PENDING_KEY, (set(), set()))
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Project):
+            user_ids.add(obj.owner_id)
+            project_ids.add(obj.id)
+        elif isinstance(obj, (Feature, CustomFunction, ApiRequestLog, ApiUsageDaily, TestRecord)):
+            project_ids.add(_project_id(obj.project_id))
+    project_ids.discard(None)
+
+
+def _after_commit(session):
+    # Dropped only once the change is visible: invalidating at flush time would let a request
+    # re-cache state that is not committed yet (or is about to be rolled back)
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending and (pending[0] or pending[1]):
+        stats_cache.invalidate(*pending)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def init_stats_cache(app):
+    """Hook invalidation into ORM flushes and commits (idempotent across app instances)"""
+    stats_cache.clear()
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
@@ -0,0 +1,139 @@
+from app import db
+from app.models import Project, ApiRequestLog, ApiUsageDaily, ApiUsageHourly
+from datetime import datetime, timedelta
+from sqlalchemy import func, delete
+from app.services.retention_service import delete_in_batches
+from app.services.stats_cache import stats_cache
+
+
+def _hour(at):
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def _as_date(value):
+    # func.date() comes back as a string on SQLite
+    return datetime.strptime(value, '%Y-%m-%d').date() if isinstance(value, str) else value
+
+
+def _increment(model, bucket, amount=1):
+    """Atomic upsert of one rollup counter; falls back to update-then-insert on other dialects"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(model).values(**bucket, request_count=amount).on_conflict_do_update(
+            index_elements=list(bucket), set_={'request_count': model.__table__.c.request_count + amount}
+        )
+        db.session.execute(stmt)
+        return
+
+    updated = db.session.query(model).filter_by(**bucket).update(
+        {model.request_count: model.request_count + amount}, synchronize_session=False
+    )
+    if not updated:
+        db.session.add(model(**bucket, request_count=amount))
+
+
+class UsageService:
+    """External API usage: rollup maintenance, compaction and raw log retention"""
+
+    @staticmethod
+    def record(log):
+        """Count a request log in the daily and hourly rollups; commits with the caller's transaction"""
+        at = log.created_at or datetime.utcnow()
+        feature_id = log.feature_id or 0
+        _increment(ApiUsageDaily, {'project_id': log.project_id, 'feature_id': feature_id, 'day': at.date()})
+        _increment(ApiUsageHourly, {'project_id': log.project_id, 'feature_id': feature_id, 'hour': _hour(at)})
+
+    @staticmethod
+    def compact(since, log_retention_days=0, now=None):
+        """
+        Rebuild the rollups from raw logs for every closed bucket from `since` on: days before
+        today and hours before the current one. Open buckets are only ever incremented by
+        record(), so live traffic cannot race the rebuild. Days older than the raw log retention
+        are left alone, since their logs are already gone.
+        """
+        now = now or datetime.utcnow()
+        since = datetime.combine(since.date() if isinstance(since, datetime) else since, datetime.min.time())
+        cutoff = UsageService._retention_cutoff(log_retention_days, now)
+        if cutoff and since < cutoff:
+            since = datetime.combine(cutoff.date() + timedelta(days=1), datetime.min.time())
+        day_end = datetime.combine(now.date(), datetime.min.time())
+        hour_end = _hour(now)
+
+        feature = func.coalesce(ApiRequestLog.feature_id, 0)
+        day = func.date(ApiRequestLog.created_at)
+        daily = [(p, f, _as_date(d), n) for p, f, d, n in db.session.query(
+            ApiRequestLog.project_id, feature, day, func.count()
+        ).filter(
+            ApiRequestLog.created_at >= since, ApiRequestLog.created_at < day_end
+        ).group_by(ApiRequestLog.project_id, feature, day)]
+
+        # Hours are bucketed in Python so the statement stays portable across dialects
+        hourly = {}
+        rows = db.session.query(ApiRequestLog.project_id, feature, ApiRequestLog.created_at).filter(
+            ApiRequestLog.created_at >= since, ApiRequestLog.created_at < hour_end
+        ).yield_per(5000)
+        for project_id, feature_id, created_at in rows:
+            key = (project_id, feature_id, _hour(created_at))
+            hourly[key] = hourly.get(key, 0) + 1
+
+        db.session.execute(delete(ApiUsageDaily).where(ApiUsageDaily.day >= since.date(), ApiUsageDaily.day < day_end.date()))
+        db.session.execute(delete(ApiUsageHourly).where(ApiUsageHourly.hour >= since, ApiUsageHourly.hour < hour_end))
+        db.session.add_all(
+            ApiUsageDaily(project_id=p, feature_id=f, day=d, request_count=n) for p, f, d, n in daily
+        )
+        db.session.add_all(
+            ApiUsageHourly(project_id=p, feature_id=f, hour=h, request_count=n) for (p, f, h), n in hourly.items()
+        )
+        db.session.commit()
+        # The rollups were rewritten with bulk statements, which the stats cache listener cannot see
+        stats_cache.clear()
+        return {'days': len({d for _, _, d, _ in daily}), 'daily_rows': len(daily), 'hourly_rows': len(hourly)}
+
+    @staticmethod
+    def purge(log_retention_days, hourly_retention_days=0, batch_size=1000):
+        """Delete raw logs and hourly rollups past their retention in bounded batches; 0 keeps forever"""
+        purged = {'logs': 0, 'hourly': 0}
+
+        cutoff = UsageService._retention_cutoff(log_retention_days)
+        if cutoff:
+            purged['logs'] = delete_in_batches(ApiRequestLog, ApiRequestLog.created_at < cutoff, batch_size)
+
+        cutoff = UsageService._retention_cutoff(hourly_retention_days)
+        if cutoff:
+            purged['hourly'] = delete_in_batches(ApiUsageHourly, ApiUsageHourly.hour < cutoff, batch_size)
+
+        if purged['logs'] or purged['hourly']:
+            stats_cache.clear()
+        return purged
+
+    @staticmethod
+    def get_project_usage(project_id, user_id, granularity='day', days=14):
+        """Usage series for one project read from the rollups"""
+        project = db.session.get(Project, project_id)
+        if not project or project.status == 'deleted':
+            return {'error': 'Project not found'}, 404
+        if project.owner_id != int(user_id):
+            return {'error': 'Unauthorized'}, 403
+        if granularity not in ('day', 'hour'):
+            return {'error': "granularity must be 'day' or 'hour'"}, 400
+
+        model, bucket = (ApiUsageDaily, ApiUsageDaily.day) if granularity == 'day' else (ApiUsageHourly, ApiUsageHourly.hour)
+        since = datetime.utcnow() - timedelta(days=days)
+        rows = db.session.query(bucket, func.sum(model.request_count)).filter(
+            model.project_id == project_id,
+            bucket >= (since.date() if granularity == 'day' else _hour(since))
+        ).group_by(bucket).order_by(bucket).all()
+
+        return {
+            'projectId': project_id,
+            'granularity': granularity,
+            'usage': [{'bucket': b.isoformat(), 'count': int(n)} for b, n in rows]
+        }, 200
+
+    @staticmethod
+    def _retention_cutoff(days, now=None):
+        return (now or datetime.utcnow()) - timedelta(days=days) if days and days > 0 else None
@@ -0,0 +1,171 @@
+"""
+Per-process caches for authenticated requests: verified access tokens to their claims, and
+user ids to the few user fields authorization needs. Token entries never outlive the token's
+own `exp`; user entries are dropped when a flush touches the user or a role, and again once
+that transaction commits. Invalidation only reaches the process that made the change: other
+workers see role and is_active changes after at most USER_CACHE_TTL seconds.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from flask import current_app, g, request
+from flask_jwt_extended import verify_jwt_in_request
+from flask_jwt_extended.config import config as jwt_config
+from flask_jwt_extended.internal_utils import has_user_lookup
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+class TTLCache:
+    """Bounded LRU mapping with a per-entry expiry (time.time() based)"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.time() >= expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, expires_at):
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+claims_cache = TTLCache()
+user_cache = TTLCache()
+
+
+def _bearer_token():
+    """Raw access token when the app reads plain 'Authorization: Bearer' headers, else None"""
+    if request.method in jwt_config.exempt_methods:
+        return None
+    if tuple(jwt_config.token_location) != ('headers',) or jwt_config.header_name != 'Authorization':
+        return None
+    parts = request.headers.get('Authorization', '').split()
+    if len(parts) != 2 or parts[0] != jwt_config.header_type:
+        return None
+    return parts[1]
+
+
+def verify_jwt_cached():
+    """
+    Same contract as verify_jwt_in_request() for access tokens, skipping signature and claim
+    verification for tokens already verified within JWT_CLAIMS_CACHE_TTL seconds.
+    """
+    ttl = current_app.config.get('JWT_CLAIMS_CACHE_TTL', 0)
+    token = _bearer_token() if ttl and not has_user_lookup() else None
+    if token is None:
+        return verify_jwt_in_request()
+
+    key = hashlib.sha256(token.encode('utf-8')).hexdigest()
+    cached = claims_cache.get(key)
+    if cached is not None:
+        jwt_header, jwt_data = cached
+        # What verify_jwt_in_request() leaves behind for get_jwt_identity() and friends
+        g._jwt_extended_jwt_user = None
+        g._jwt_extended_jwt_header = jwt_header
+        g._jwt_extended_jwt = jwt_data
+        g._jwt_extended_jwt_location = 'headers'
+        return jwt_header, jwt_data
+
+    jwt_header, jwt_data = verify_jwt_in_request()
+    expires_at = time.time() + ttl
+    if 'exp' in jwt_data:
+        expires_at = min(expires_at, jwt_data['exp'])
+    claims_cache.set(key, (jwt_header, jwt_data), expires_at)
+    return jwt_header, jwt_data
+
+
+def get_user_snapshot(user_id):
+    """{'id', 'role', 'is_active'} for a user id, or None if there is no such user"""
+    from app import db
+    from app.models import User
+
+    try:
+        key = int(user_id)
+    except (TypeError, ValueError):
+        return None
+    snapshot = user_cache.get(key)
+    if snapshot is not None:
+        return snapshot
+
+    user = db.session.get(User, key)
+    if not user:
+        return None
+    snapshot = {'id': user.id, 'role': user.role.name if user.role else None, 'is_active': user.is_active}
+    ttl = current_app.config.get('USER_CACHE_TTL', 0)
+    if ttl:
+        user_cache.set(key, snapshot, time.time() + ttl)
+    return snapshot
+
+
+_PENDING_KEY = 'auth_cache_pending'
+_ALL = object()
+
+
+def _invalidate(pending):
+    if _ALL in pending:
+        user_cache.clear()
+        return
+    for user_id in pending:
+        user_cache.pop(user_id)
+
+
+def _after_flush(session, flush_context):
+    from app.models import User, Role
+
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Role):
+            # Role renames affect every user holding the role
+            pending.add(_ALL)
+        elif isinstance(obj, User) and obj.id is not None:
+            pending.add(obj.id)
+    _invalidate(pending)
+
+
+def _after_commit(session):
+    # A concurrent request may have re-cached the pre-commit row between flush and commit
+    pending = session.info.pop(_PENDING_KEY, None)
+    if pending:
+        _invalidate(pending)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def init_auth_cache(app):
+    """Start each app with empty caches and hook user invalidation into ORM flushes and commits"""
+    claims_cache.clear()
+    user_cache.clear()
+    if not event.contains(Session, 'after_flush', _after_flush):
+        event.listen(Session, 'after_flush', _after_flush)
+        event.listen(Session, 'after_commit', _after_commit)
+        event.listen(Session, 'after_rollback', _after_rollback)
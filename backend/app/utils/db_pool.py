@@ -0,0 +1,100 @@
+"""
+Connection pool instrumentation. InstrumentedQueuePool times every checkout (waiting for a free
+connection, or opening a new one) and counts timeouts; pool_status() adds the live occupancy so
+pool sizing can be tuned per gunicorn worker. Numbers are per process.
+"""
+import threading
+import time
+from collections import deque
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics:
+    """Checkout wait statistics shared by every instrumented pool in the process"""
+
+    def __init__(self, window=1024):
+        self._lock = threading.Lock()
+        self.reset(window)
+
+    def reset(self, window=1024):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.recent = deque(maxlen=window)
+
+    def record(self, seconds, timed_out=False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += seconds
+            self.wait_max = max(self.wait_max, seconds)
+            self.recent.append(seconds)
+
+    def to_dict(self):
+        with self._lock:
+            ordered = sorted(self.recent)
+            p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))] if ordered else None
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'wait_avg_ms': round(self.wait_total / self.checkouts * 1000, 3) if self.checkouts else None,
+                'wait_p95_ms': round(p95 * 1000, 3) if p95 is not None else None,
+                'wait_max_ms': round(self.wait_max * 1000, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_metrics.record(time.perf_counter() - started)
+        return conn
+
+
+def pool_status(engine, max_overflow=None):
+    """
+    Occupancy of the engine's pool plus checkout wait metrics. `max_overflow` is the configured
+    value (SQLALCHEMY_ENGINE_OPTIONS); QueuePool exposes no public accessor for it.
+    """
+    pool = engine.pool
+    status = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        if max_overflow is None:
+            # Engines built outside the app config: fall back to QueuePool's private attribute,
+            # and report no saturation if a future SQLAlchemy drops it
+            max_overflow = getattr(pool, '_max_overflow', None)
+        checked_out = pool.checkedout()
+        capacity = pool.size() + max_overflow if max_overflow is not None and max_overflow >= 0 else None
+        status.update({
+            'size': pool.size(),
+            'max_overflow': max_overflow,
+            'checked_out': checked_out,
+            'checked_in': pool.checkedin(),
+            'overflow': pool.overflow(),
+            'saturation': round(checked_out / capacity, 3) if capacity else None,
+        })
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(pool_metrics.to_dict())
+    return status
+
+
+def init_db_pool(app):
+    """Use the instrumented pool wherever the config sizes a queue pool (server databases)"""
+    options = app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {}
+    if 'pool_size' in options and 'poolclass' not in options:
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {**options, 'poolclass': InstrumentedQueuePool}
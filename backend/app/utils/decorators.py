@@ -1,7 +1,7 @@
 from functools import wraps
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_jwt_extended import get_jwt_identity
 from flask import jsonify, current_app
-from app.models import User
+from app.utils.auth_cache import verify_jwt_cached, get_user_snapshot
 
 def token_required(f):
     """Decorator to require valid JWT token"""
@@ -13,7 +13,7 @@ def token_required(f):
             return jsonify({'status': 'ok'}), 200
             
         try:
-            verify_jwt_in_request()
+            verify_jwt_cached()
             return f(*args, **kwargs)
         except Exception as e:
             print(f"JWT Verification Failed: {str(e)}")  # Debug logging
@@ -25,11 +25,10 @@ def role_required(roles):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            verify_jwt_in_request()
-            user_id = get_jwt_identity()
-            user = User.query.get(user_id)
+            verify_jwt_cached()
+            user = get_user_snapshot(get_jwt_identity())
             
-            if not user or user.role.name not in roles:
+            if not user or not user.get('is_active') or user['role'] not in roles:
                 return jsonify({'error': 'Forbidden', 'message': 'Insufficient permissions'}), 403
             
             return f(*args, **kwargs)
@@ -0,0 +1,76 @@
+"""
+JSON provider that serializes with orjson when it is installed and falls back to the
+standard library otherwise. Both paths emit datetimes as ISO 8601 and Decimals as strings.
+Generated projects with the fast_json option ship this module verbatim.
+"""
+import dataclasses
+import decimal
+import json
+import uuid
+from datetime import date, datetime, time
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(o):
+    """Types neither serializer handles on its own"""
+    if isinstance(o, decimal.Decimal):
+        return str(o)
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, uuid.UUID):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if isinstance(o, (set, frozenset)):
+        return list(o)
+    if hasattr(o, '__html__'):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Drop-in replacement for the default provider, installed as `app.json` in create_app"""
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and set(kwargs) <= {'indent'}:
+            return self._encode(obj, kwargs.get('indent')).decode('utf-8')
+        kwargs.setdefault('default', _default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        """Same output as the default provider, without a str round trip for orjson's bytes"""
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = self._encode(obj, 2 if pretty else None) + b'\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+    def _encode(self, obj, indent=None):
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if self.sort_keys:
+                option |= orjson.OPT_SORT_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(obj, default=_default, option=option)
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits or mixed-type keys; the stdlib copes
+                pass
+        separators = None if indent else (',', ':')
+        return json.dumps(
+            obj, default=_default, ensure_ascii=self.ensure_ascii, sort_keys=self.sort_keys,
+            indent=indent, separators=separators
+        ).encode('utf-8')
@@ -0,0 +1,158 @@
+"""
+Opt-in SQL instrumentation on SQLAlchemy engine events. Each request (SQL_PROFILER=True) gets
+a query count, total query time and a count per statement fingerprint. A SELECT fingerprint
+repeating more than SQL_PROFILER_N_PLUS_ONE_THRESHOLD times is reported as a likely N+1.
+Tests can use profile_queries() / assert_max_queries() without enabling the middleware.
+"""
+import contextvars
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+from flask import g
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_active = contextvars.ContextVar('sql_profiles', default=())
+
+_FINGERPRINT_RULES = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                      # string literals
+    (re.compile(r'%\(\w+\)s|\$\d+|(?<!:):\w+'), '?'),          # pyformat, numeric and named params
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),                   # numeric literals
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(?...)'),     # IN lists of any length
+    (re.compile(r'\s+'), ' '),
+]
+
+
+def fingerprint(statement):
+    """Statement with literals, parameters and IN-list lengths normalized away"""
+    for pattern, replacement in _FINGERPRINT_RULES:
+        statement = pattern.sub(replacement, statement)
+    return statement.strip()
+
+
+class QueryProfile:
+    """Queries seen while the profile was active"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints = Counter()
+        self.statements = []
+
+    def record(self, statement, duration):
+        self.count += 1
+        self.duration += duration
+        self.fingerprints[fingerprint(statement)] += 1
+        self.statements.append(statement)
+
+    def repeated(self, threshold):
+        """SELECT fingerprints executed more than `threshold` times, most frequent first"""
+        return [
+            (fp, n) for fp, n in self.fingerprints.most_common()
+            if n > threshold and fp.lstrip('( ').upper().startswith('SELECT')
+        ]
+
+    def summary(self, threshold):
+        return {
+            'count': self.count,
+            'duration_ms': round(self.duration * 1000, 2),
+            'n_plus_one': [{'fingerprint': fp, 'count': n} for fp, n in self.repeated(threshold)],
+        }
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # The start time lives on the per-statement execution context, so a statement that raises
+    # leaves nothing behind on the (pooled) connection
+    if _active.get() and context is not None:
+        context._sql_profiler_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profiles = _active.get()
+    started = getattr(context, '_sql_profiler_start', None)
+    if not profiles or started is None:
+        return
+    duration = time.perf_counter() - started
+    for profile in profiles:
+        profile.record(statement, duration)
+
+
+def _ensure_listeners():
+    # Listening on the Engine class covers every app's engine; without an active profile the
+    # handlers return after one context variable lookup
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def _push(profile):
+    _active.set(_active.get() + (profile,))
+
+
+def _pop(profile):
+    _active.set(tuple(p for p in _active.get() if p is not profile))
+
+
+@contextmanager
+def profile_queries():
+    """Collect every query executed in this context (thread/task) into a QueryProfile"""
+    _ensure_listeners()
+    profile = QueryProfile()
+    _push(profile)
+    try:
+        yield profile
+    finally:
+        _pop(profile)
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """Test helper: fail if the block runs more than `limit` queries, listing what ran"""
+    with profile_queries() as profile:
+        yield profile
+    if profile.count > limit:
+        ran = '\n'.join(f'  {n}x {fp}' for fp, n in profile.fingerprints.most_common())
+        raise AssertionError(f'Expected at most {limit} queries, {profile.count} ran:\n{ran}')
+
+
+def init_sql_profiler(app):
+    """Per-request profiling with X-Query-* headers and a log line, when SQL_PROFILER is on"""
+    if not app.config.get('SQL_PROFILER'):
+        return
+    _ensure_listeners()
+    threshold = app.config.get('SQL_PROFILER_N_PLUS_ONE_THRESHOLD', 5)
+
+    @app.before_request
+    def _start_sql_profile():
+        g.sql_profile = QueryProfile()
+        _push(g.sql_profile)
+
+    @app.after_request
+    def _report_sql_profile(response):
+        profile = g.pop('sql_profile', None)
+        if profile is None:
+            return response
+        _pop(profile)
+
+        from flask import request
+        summary = profile.summary(threshold)
+        response.headers['X-Query-Count'] = str(summary['count'])
+        response.headers['X-Query-Time-Ms'] = str(summary['duration_ms'])
+        app.logger.info('%s %s: %d queries in %.1fms', request.method, request.path, summary['count'], summary['duration_ms'])
+        if summary['n_plus_one']:
+            worst = summary['n_plus_one'][0]
+            response.headers['X-Query-N-Plus-One'] = str(len(summary['n_plus_one']))
+            app.logger.warning(
+                'Possible N+1 on %s %s: %d statement(s) repeated, worst %dx: %s',
+                request.method, request.path, len(summary['n_plus_one']), worst['count'], worst['fingerprint']
+            )
+        return response
+
+    @app.teardown_request
+    def _drop_sql_profile(exc):
+        # after_request is skipped on unhandled errors
+        profile = g.pop('sql_profile', None)
+        if profile is not None:
+            _pop(profile)
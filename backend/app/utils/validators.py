@@ -24,12 +24,19 @@ class ProjectCreateSchema(BaseModel):
     name: str
     description: Optional[str] = None
     generation_mode: str = 'manual'  # manual, ai, mixed
+    generation_target: str = 'flask'  # flask, asgi
     
     @validator('name')
     def name_length(cls, v):
         if len(v) < 3 or len(v) > 255:
             raise ValueError('Project name must be between 3 and 255 characters')
         return v
+    
+    @validator('generation_target')
+    def target_supported(cls, v):
+        if v not in ('flask', 'asgi'):
+            raise ValueError("Generation target must be 'flask' or 'asgi'")
+        return v
 
 class FeatureCreateSchema(BaseModel):
     """Feature creation schema"""
@@ -0,0 +1,98 @@
+from datetime import timedelta
+import pytest
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models import User, Role
+from app.utils import auth_cache
+
+METRICS = '/api/auth/metrics/password-hashing'
+
+
+@pytest.fixture
+def admin(app):
+    role = Role.query.filter_by(name='admin').first()
+    user = User(email='admin@example.com', first_name='Ad', last_name='Min', role_id=role.id)
+    user.set_password('Test123!')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def verifications(monkeypatch):
+    calls = []
+    original = auth_cache.verify_jwt_in_request
+
+    def counting():
+        calls.append(1)
+        return original()
+
+    monkeypatch.setattr(auth_cache, 'verify_jwt_in_request', counting)
+    return calls
+
+
+def _headers(token):
+    return {'Authorization': f'Bearer {token}'}
+
+
+def test_verified_token_is_reused(client, admin, verifications):
+    token = create_access_token(identity=str(admin.id))
+    for _ in range(3):
+        response = client.get('/api/auth/profile', headers=_headers(token))
+        assert response.status_code == 200
+        assert response.json['user']['email'] == 'admin@example.com'
+    assert len(verifications) == 1
+
+    # A different (bad) token is still verified in full
+    assert client.get('/api/auth/profile', headers=_headers(token + 'x')).status_code == 401
+    assert len(verifications) == 2
+
+
+def test_cached_claims_never_outlive_the_token(app, client, admin):
+    token = create_access_token(identity=str(admin.id), expires_delta=timedelta(seconds=5))
+    client.get('/api/auth/profile', headers=_headers(token))
+    (expires_at, (_, claims)), = auth_cache.claims_cache._entries.values()
+    assert expires_at == claims['exp']
+
+
+def test_cache_disabled_verifies_every_request(app, client, admin, verifications, monkeypatch):
+    monkeypatch.setitem(app.config, 'JWT_CLAIMS_CACHE_TTL', 0)
+    token = create_access_token(identity=str(admin.id))
+    client.get('/api/auth/profile', headers=_headers(token))
+    client.get('/api/auth/profile', headers=_headers(token))
+    assert len(verifications) == 2
+
+
+def test_user_cache_follows_role_and_active_changes(app, client, admin):
+    token = create_access_token(identity=str(admin.id))
+    assert client.get(METRICS, headers=_headers(token)).status_code == 200
+    assert auth_cache.user_cache.get(admin.id)['role'] == 'admin'
+
+    admin.role_id = Role.query.filter_by(name='user').first().id
+    db.session.commit()
+    assert client.get(METRICS, headers=_headers(token)).status_code == 403
+
+    admin.role_id = Role.query.filter_by(name='admin').first().id
+    admin.is_active = False
+    db.session.commit()
+    assert client.get(METRICS, headers=_headers(token)).status_code == 403
+
+
+def test_role_rename_clears_user_cache(app, admin):
+    assert auth_cache.get_user_snapshot(admin.id)['role'] == 'admin'
+    Role.query.filter_by(name='admin').first().name = 'owner'
+    db.session.commit()
+    assert auth_cache.get_user_snapshot(admin.id)['role'] == 'owner'
+
+
+def test_commit_drops_entries_recached_after_flush(app, admin):
+    snapshot = auth_cache.get_user_snapshot(admin.id)
+    admin.is_active = False
+    db.session.flush()
+    assert auth_cache.user_cache.get(admin.id) is None
+
+    # A concurrent request reading the pre-commit row re-caches it
+    auth_cache.user_cache.set(admin.id, snapshot, float('inf'))
+    db.session.commit()
+    assert auth_cache.user_cache.get(admin.id) is None
+    assert auth_cache.get_user_snapshot(admin.id)['is_active'] is False
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from app import create_app, db
+from app.utils.db_pool import InstrumentedQueuePool, pool_metrics, pool_status
+from config.settings import TestingConfig, engine_options
+
+
+def test_engine_options_from_environment(monkeypatch):
+    monkeypatch.setenv('DB_POOL_SIZE', '3')
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '5000')
+    options = engine_options('postgresql://u:p@db/app')
+    assert options['pool_size'] == 3
+    assert options['max_overflow'] == 10 and options['pool_pre_ping'] is True
+    assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '0')
+    assert 'connect_args' not in engine_options('postgresql://u:p@db/app')
+    assert engine_options('sqlite:///:memory:') == {}
+
+
+def test_instrumented_pool_records_waits_and_timeouts(tmp_path):
+    pool_metrics.reset()
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+    )
+    conn = engine.connect()
+    conn.execute(text('SELECT 1'))
+    status = pool_status(engine)
+    assert status['checked_out'] == 1 and status['saturation'] == 1.0
+
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+    conn.close()
+
+    status = pool_status(engine)
+    assert status['checkouts'] == 1 and status['timeouts'] == 1
+    assert status['checked_out'] == 0 and status['saturation'] == 0.0
+    engine.dispose()
+
+
+def test_app_uses_instrumented_pool_for_sized_options(tmp_path):
+    class PooledConfig(TestingConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path / 'app.db'}"
+        SQLALCHEMY_ENGINE_OPTIONS = {'pool_size': 2, 'max_overflow': 1}
+        POOL_METRICS_TOKEN = 'pool-secret'
+
+    from config.settings import config
+    config['pooled'] = PooledConfig
+    try:
+        app = create_app('pooled')
+    finally:
+        del config['pooled']
+    with app.app_context():
+        assert isinstance(db.engine.pool, InstrumentedQueuePool)
+        client = app.test_client()
+        assert client.get('/health/pool').status_code == 401
+        response = client.get('/health/pool', headers={'Authorization': 'Bearer pool-secret'})
+        assert response.status_code == 200
+        assert response.get_json()['size'] == 2 and response.get_json()['max_overflow'] == 1
+        db.engine.dispose()
+
+
+def test_pool_health_without_queue_pool(app, client):
+    assert client.get('/health/pool').status_code == 404
+
+    app.config['POOL_METRICS_TOKEN'] = 'pool-secret'
+    response = client.get('/health/pool', headers={'Authorization': 'Bearer pool-secret'})
+    assert response.get_json() == {'pool': 'StaticPool'}
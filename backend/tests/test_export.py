@@ -0,0 +1,106 @@
+import io
+import json
+import os
+import zipfile
+import pytest
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models import User, Role, Project, Feature, CustomFunction
+from app.services.export_service import ExportService
+from app.services.generator_service import GeneratorService
+
+
+@pytest.fixture
+def projects(app):
+    """Owner with two projects holding CRUD features and a custom function"""
+    role = Role.query.filter_by(name='user').first()
+    user = User(email='owner@example.com', first_name='Own', last_name='Er', role_id=role.id)
+    user.set_password('Test123!')
+    db.session.add(user)
+    db.session.commit()
+
+    created = []
+    for name in ['Alpha Shop', 'Beta Blog']:
+        project = Project(name=name, owner_id=user.id, api_key=f"key-{name}")
+        db.session.add(project)
+        db.session.flush()
+        db.session.add(Feature(project_id=project.id, name='Items', feature_type='CRUD', configuration={
+            'table': 'items', 'fields': [{'name': 'title', 'type': 'string', 'required': True}]
+        }))
+        db.session.add(CustomFunction(
+            project_id=project.id, name='ping', endpoint_path=f"/ping-{project.id}",
+            function_code="def handler(input_data):\n    return {'pong': True}"
+        ))
+        created.append(project)
+    db.session.commit()
+    return user, created
+
+
+def test_load_exports_groups_features(projects):
+    user, created = projects
+    exports = ExportService.load_exports([p.id for p in created], user.id)
+
+    assert [e['id'] for e in exports] == [p.id for p in created]
+    for export in exports:
+        assert [f['type'] for f in export['features']] == ['CRUD', 'FUNCTIONS']
+
+
+def test_load_exports_filters_other_owners(projects):
+    _, created = projects
+    assert ExportService.load_exports([p.id for p in created], user_id=9999) == []
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_stream_archive_contains_project_zips(projects, workers):
+    user, created = projects
+    exports = ExportService.load_exports([p.id for p in created], user.id)
+    seen = []
+    data = b''.join(ExportService.stream_archive(exports, 'fast', workers, lambda *args: seen.append(args[0])))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as outer:
+        manifest = json.loads(outer.read('manifest.json'))
+        assert [p['status'] for p in manifest['projects']] == ['ok', 'ok']
+        for export in exports:
+            with zipfile.ZipFile(io.BytesIO(outer.read(export['filename']))) as inner:
+                assert 'def route_ping' in inner.read('app/routes/functions.py').decode()
+    assert sorted(seen) == [1, 2]
+
+
+def test_export_projects_command(projects, runner, tmp_path):
+    _, created = projects
+    result = runner.invoke(args=['export-projects', *[str(p.id) for p in created],
+                                 '--out-dir', str(tmp_path), '--workers', '1'])
+
+    assert result.exit_code == 0, result.output
+    assert 'Exported 2 project(s), 0 failed' in result.output
+    assert sorted(os.listdir(tmp_path)) == sorted(f"{p.name.lower().replace(' ', '_')}_{p.id}.zip" for p in created)
+
+
+def test_bulk_export_route(projects, client):
+    user, created = projects
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+    response = client.post('/api/projects/bulk-export', json={'project_ids': [p.id for p in created]}, headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers['X-Export-Count'] == '2'
+    with zipfile.ZipFile(io.BytesIO(response.data)) as outer:
+        assert 'manifest.json' in outer.namelist()
+
+
+def test_load_exports_applies_generation_options(projects):
+    user, created = projects
+    exports = ExportService.load_exports([created[0].id], user.id, {'profile': 'production', 'instrumentation': True})
+    files = GeneratorService.get_project_files(exports[0]['project_info'], exports[0]['features'])
+
+    assert exports[0]['project_info']['options'] == {'target': 'flask', 'profile': 'production', 'instrumentation': True}
+    assert {'gunicorn.conf.py', 'Dockerfile', 'app/metrics.py'} <= set(files)
+    assert f"@api_bp.route('/ping-{created[0].id}'" in files['app/routes/functions.py']
+
+
+def test_bulk_export_route_rejects_unknown_target(projects, client):
+    user, created = projects
+    headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+    response = client.post('/api/projects/bulk-export', json={
+        'project_ids': [p.id for p in created], 'options': {'target': 'cobol'}
+    }, headers=headers)
+    assert response.status_code == 400
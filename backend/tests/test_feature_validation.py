@@ -0,0 +1,93 @@
+from app.services.features.auth import AuthHandler
+from app.services.features.crud import CRUDHandler
+from app.services.features.validation import get_validator
+
+BOOKS = {'table': 'books', 'fields': [
+    {'name': 'title', 'type': 'string', 'required': True},
+    {'name': 'pages', 'type': 'integer'},
+    {'name': 'published', 'type': 'boolean'},
+    {'name': 'released_at', 'type': 'datetime'},
+]}
+CONTEXT = {'user_id': 1, 'project_id': 1}
+
+
+def test_validator_is_cached_per_config():
+    first = get_validator(BOOKS['fields'], {'id': 'integer'})
+    assert get_validator([dict(f) for f in BOOKS['fields']], {'id': 'integer'}) is first
+    assert get_validator(BOOKS['fields']) is not first
+    assert first.allowed == {'title', 'pages', 'published', 'released_at', 'id'}
+
+
+def test_validator_cache_evicts_least_recently_used(monkeypatch):
+    from app.services.features import validation
+    monkeypatch.setattr(validation, '_MAX_VALIDATORS', 2)
+    monkeypatch.setattr(validation, '_validators', validation.OrderedDict())
+    configs = [[{'name': name, 'type': 'string'}] for name in ('a', 'b', 'c')]
+
+    first = get_validator(configs[0])
+    get_validator(configs[1])
+    assert get_validator(configs[0]) is first  # refreshes 'a'
+    get_validator(configs[2])  # evicts 'b'
+
+    assert get_validator(configs[0]) is first
+    assert len(validation._validators) == 2
+
+
+def test_validator_checks_in_order():
+    validator = get_validator(BOOKS['fields'], {'id': 'integer'})
+    assert validator.validate({'title': 'A', 'isbn': 'x'}) == (None, 'Unexpected fields: isbn')
+    assert validator.validate({'pages': 3}) == (None, 'Missing required fields: title')
+    assert validator.validate({'pages': 3}, partial=True) == ({'pages': 3}, None)
+    assert validator.validate({'title': 'A', 'pages': 'many', 'id': 'x'}) == (
+        None, 'Invalid field types: pages (expected integer), id (expected integer)'
+    )
+
+
+def test_validator_coerces_to_json_safe_values():
+    validator = get_validator(BOOKS['fields'], {'id': 'integer'})
+    data, error = validator.validate({
+        'title': 'A', 'pages': '12', 'published': 'true', 'released_at': '2024-05-01T10:00:00', 'id': '4'
+    })
+    assert error is None
+    assert data == {'title': 'A', 'pages': 12, 'published': True, 'released_at': '2024-05-01T10:00:00', 'id': 4}
+
+
+def test_validator_accepts_awkward_field_names():
+    validator = get_validator([{'name': 'model_config', 'type': 'integer'}, {'name': 'first name', 'type': 'string'}])
+    assert validator.validate({'model_config': '1', 'first name': 'Ada'}) == (
+        {'model_config': 1, 'first name': 'Ada'}, None
+    )
+
+
+def test_crud_handler_stores_coerced_body(app):
+    handler = CRUDHandler()
+    result, status = handler.handle('POST', '/api/books', {'title': 'Dune', 'pages': '412'}, BOOKS, CONTEXT)
+    assert status == 201
+    assert result['data'] == {'title': 'Dune', 'pages': 412, 'id': 1}
+
+    result, status = handler.handle('POST', '/api/books', {'title': 'Dune', 'pages': 'long'}, BOOKS, CONTEXT)
+    assert status == 400
+    assert result['message'] == 'Invalid field types: pages (expected integer)'
+
+    result, status = handler.handle('PUT', '/api/books/1', {'id': '1', 'title': 'Dune II'}, BOOKS, CONTEXT)
+    assert status == 200
+    result, _ = handler.handle('GET', '/api/books/1', {}, BOOKS, CONTEXT)
+    assert result['data'] == {'id': 1, 'title': 'Dune II'}
+
+
+def test_auth_register_validates_extra_fields(app):
+    handler = AuthHandler()
+    schema = {'extra_fields': ['nickname', {'name': 'age', 'type': 'integer', 'required': True}]}
+    body = {'email': 'a@example.com', 'password': 'secret'}
+
+    result, status = handler.handle('POST', '/api/auth/register', dict(body, age='old'), schema, CONTEXT)
+    assert status == 400
+    assert result['message'] == 'Invalid field types: age (expected integer)'
+
+    result, status = handler.handle('POST', '/api/auth/register', dict(body), schema, CONTEXT)
+    assert result['message'] == 'Missing required fields: age'
+
+    result, status = handler.handle('POST', '/api/auth/register', dict(body, age='30', nickname=7), schema, CONTEXT)
+    assert status == 201
+    assert result['user']['age'] == 30
+    assert result['user']['nickname'] == 7
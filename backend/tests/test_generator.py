@@ -0,0 +1,638 @@
+import io
+import zipfile
+import pytest
+from app.services.generator_service import GeneratorService
+
+PROJECT_INFO = {'name': 'Book Store'}
+FEATURES = [
+    {'name': 'Auth', 'type': 'AUTH', 'config': {'extra_fields': [{'name': 'username', 'type': 'string'}]}},
+    {'name': 'Books', 'type': 'CRUD', 'config': {'table': 'books', 'fields': [
+        {'name': 'title', 'type': 'string', 'required': True},
+        {'name': 'pages', 'type': 'integer'},
+    ]}},
+    {'name': 'Stats', 'type': 'ANALYTICS', 'config': {'reports': [
+        {'name': 'total_books', 'entity': 'books', 'type': 'count'},
+    ]}},
+    {'name': 'Greet', 'type': 'FUNCTIONS', 'config': {
+        'name': 'greet', 'code': "def handler(input_data):\n    return {'hello': input_data.get('name')}"
+    }},
+]
+
+
+def test_stream_project_matches_project_files():
+    """Streamed archive contains every generated file"""
+    files = GeneratorService.get_project_files(PROJECT_INFO, FEATURES)
+    data = b''.join(GeneratorService.stream_project(PROJECT_INFO, FEATURES))
+
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        assert zf.testzip() is None
+        assert set(zf.namelist()) == set(files)
+        for path, content in files.items():
+            assert zf.read(path).decode('utf-8') == content
+
+
+def test_stream_project_yields_multiple_chunks():
+    """Chunks are yielded per file rather than once at the end"""
+    chunks = list(GeneratorService.stream_project(PROJECT_INFO, FEATURES))
+    assert len(chunks) > 1
+
+
+@pytest.mark.parametrize('compression', ['store', 'fast', 'default', 'best'])
+def test_stream_project_compression_levels(compression):
+    """Every compression preset produces a readable archive"""
+    memory_file = GeneratorService.generate_project(PROJECT_INFO, FEATURES, compression)
+    with zipfile.ZipFile(memory_file) as zf:
+        expected = zipfile.ZIP_STORED if compression == 'store' else zipfile.ZIP_DEFLATED
+        assert all(info.compress_type == expected for info in zf.infolist())
+
+
+def test_stream_project_rejects_unknown_compression():
+    with pytest.raises(ValueError):
+        list(GeneratorService.stream_project(PROJECT_INFO, FEATURES, 'ultra'))
+
+
+def test_download_streams_zip(client):
+    response = client.post('/api/projects/download', json={
+        'projectInfo': PROJECT_INFO, 'features': FEATURES, 'compression': 'fast'
+    })
+    assert response.status_code == 200
+    assert response.mimetype == 'application/zip'
+    assert 'book_store.zip' in response.headers['Content-Disposition']
+    with zipfile.ZipFile(io.BytesIO(response.data)) as zf:
+        assert 'app/routes/crud.py' in zf.namelist()
+
+
+def test_download_reports_generation_errors(client):
+    """A feature the generator cannot render fails the request instead of truncating the zip"""
+    response = client.post('/api/projects/download', json={
+        'projectInfo': PROJECT_INFO,
+        'features': [{'name': 'Broken', 'type': 'CRUD', 'config': {'table': 'broken', 'fields': 5}}]
+    })
+    assert response.status_code == 500
+    assert 'error' in response.get_json()
+
+
+def test_download_rejects_unknown_compression(client):
+    response = client.post('/api/projects/download', json={
+        'projectInfo': PROJECT_INFO, 'features': FEATURES, 'compression': 'ultra'
+    })
+    assert response.status_code == 400
+
+
+def _write_project(tmp_path, features, project_info=PROJECT_INFO):
+    for path, content in GeneratorService.get_project_files(project_info, features).items():
+        target = tmp_path / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(content)
+
+
+def _run_generated(tmp_path, features, script, project_info=PROJECT_INFO):
+    """Write the generated project to tmp_path and run a script against it in a fresh interpreter"""
+    import json
+    import subprocess
+    import sys
+    import textwrap
+
+    _write_project(tmp_path, features, project_info)
+
+    prelude = textwrap.dedent("""
+        import json
+        from app import create_app, db
+        from app.config import Config
+        class TestConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite://'
+            TESTING = True
+        app = create_app(TestConfig)
+        client = app.test_client()
+        with app.app_context():
+            db.create_all()
+    """)
+    proc = subprocess.run(
+        [sys.executable, '-c', prelude + textwrap.dedent(script)],
+        cwd=tmp_path, capture_output=True, text=True, timeout=60
+    )
+    assert proc.returncode == 0, proc.stderr
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def test_generated_list_route_paginates(tmp_path):
+    features = [f for f in FEATURES if f['type'] == 'CRUD']
+    result = _run_generated(tmp_path, features, """
+        for i in range(5):
+            client.post('/api/books', json={'title': f'Book {i}', 'pages': i})
+        first = client.get('/api/books?limit=2').json
+        second = client.get(f"/api/books?limit=2&cursor={first['next_cursor']}").json
+        last = client.get('/api/books?offset=4&limit=2&fields=title').json
+        capped = client.get('/api/books?limit=1000').json
+        print(json.dumps({'first': first, 'second': second, 'last': last, 'capped': capped['limit']}))
+    """)
+
+    assert [i['title'] for i in result['first']['items']] == ['Book 0', 'Book 1']
+    assert result['first']['has_more'] is True
+    assert [i['title'] for i in result['second']['items']] == ['Book 2', 'Book 3']
+    assert result['last']['items'] == [{'id': 5, 'title': 'Book 4'}]
+    assert result['last']['has_more'] is False
+    assert result['last']['next_cursor'] is None
+    assert result['capped'] == GeneratorService.MAX_PAGE_SIZE
+
+
+def test_generated_models_declare_indexes(tmp_path):
+    books = {'name': 'Books', 'type': 'CRUD', 'config': {
+        'table': 'books',
+        'fields': [
+            {'name': 'title', 'type': 'string', 'indexed': True},
+            {'name': 'isbn', 'type': 'string', 'unique': True},
+            {'name': 'pages', 'type': 'integer'},
+        ],
+        'indexes': [['title', 'pages'], {'fields': ['owner_id', 'isbn'], 'unique': True}, ['missing']],
+    }}
+    features = [FEATURES[0], books]
+    result = _run_generated(tmp_path, features, """
+        from sqlalchemy import inspect
+        with app.app_context():
+            insp = inspect(db.engine)
+            indexes = {i['name']: [i['column_names'], bool(i['unique'])] for i in insp.get_indexes('books')}
+            uniques = [u['column_names'] for u in insp.get_unique_constraints('books')]
+        print(json.dumps({'indexes': indexes, 'uniques': uniques}))
+    """)
+
+    assert result['indexes']['ix_books_owner_id_id'] == [['owner_id', 'id'], False]
+    assert result['indexes']['ix_books_title'] == [['title'], False]
+    assert result['indexes']['ix_books_title_pages'] == [['title', 'pages'], False]
+    assert ['owner_id', 'isbn'] in result['uniques']
+    assert ['isbn'] in result['uniques']
+    assert not any('missing' in name for name in result['indexes'])
+
+
+def test_generated_function_handlers_are_module_level(tmp_path):
+    features = [
+        {'name': 'Greet', 'type': 'FUNCTIONS', 'config': {
+            'name': 'greet', 'code': "def handler(input_data):\n    return {'hello': input_data.get('name')}"
+        }},
+        {'name': 'Double', 'type': 'FUNCTIONS', 'config': {
+            'name': 'double', 'path': '/double', 'code': "result = {'value': input_data['n'] * 2}"
+        }},
+    ]
+    files = GeneratorService.get_project_files(PROJECT_INFO, features)
+    assert 'locals()' not in files['app/routes/functions.py']
+    assert 'from app.functions.greet import handler as greet_handler' in files['app/routes/functions.py']
+
+    result = _run_generated(tmp_path, features, """
+        print(json.dumps({
+            'greet': client.post('/api/greet', json={'name': 'Ada'}).json,
+            'double': client.post('/api/double', json={'n': 21}).json,
+        }))
+    """)
+    assert result == {'greet': {'hello': 'Ada'}, 'double': {'value': 42}}
+
+
+def test_generated_function_modules_import_request_helpers(tmp_path):
+    """User code keeps access to request, jsonify and db once hoisted out of the route"""
+    features = [
+        {'name': 'Search', 'type': 'FUNCTIONS', 'config': {
+            'name': 'search', 'code': "def handler(input_data):\n    return {'n': request.args.get('q')}"
+        }},
+        {'name': 'Check', 'type': 'FUNCTIONS', 'config': {
+            'name': 'check', 'code': "if not input_data:\n    return jsonify({'error': 'empty'}), 400\nresult = {'ok': True}"
+        }},
+        {'name': 'Raw', 'type': 'FUNCTIONS', 'config': {
+            'name': 'raw', 'code': "def handler(input_data):\n    return jsonify(sorted(input_data))"
+        }},
+    ]
+    files = GeneratorService.get_project_files(PROJECT_INFO, features)
+    assert files['app/functions/search.py'].startswith('from flask import request, jsonify\nfrom app import db\n')
+
+    result = _run_generated(tmp_path, features, """
+        search = client.post('/api/search?q=dune')
+        empty = client.post('/api/check')
+        ok = client.post('/api/check', json={'a': 1})
+        raw = client.post('/api/raw', json={'b': 1, 'a': 2})
+        print(json.dumps([search.json, [empty.status_code, empty.json], [ok.status_code, ok.json], raw.json]))
+    """)
+    assert result == [{'n': 'dune'}, [400, {'error': 'empty'}], [200, {'ok': True}], ['a', 'b']]
+
+
+def test_generated_function_modules_do_not_collide(tmp_path):
+    features = [
+        {'name': 'A', 'type': 'FUNCTIONS', 'config': {
+            'name': 'Get-User', 'path': '/a', 'code': "def handler(input_data):\n    return {'from': 'a'}"
+        }},
+        {'name': 'B', 'type': 'FUNCTIONS', 'config': {
+            'name': 'get_user', 'path': '/b', 'code': "def handler(input_data):\n    return {'from': 'b'}"
+        }},
+    ]
+    files = GeneratorService.get_project_files(PROJECT_INFO, features)
+    assert {'app/functions/get_user.py', 'app/functions/get_user_2.py'} <= set(files)
+    assert 'def route_get_user_2():' in files['app/routes/functions.py']
+
+    result = _run_generated(tmp_path, features, """
+        print(json.dumps([client.post('/api/a').json, client.post('/api/b').json]))
+    """)
+    assert result == [{'from': 'a'}, {'from': 'b'}]
+
+
+def test_generated_analytics_summary_batches_queries(tmp_path):
+    books = {'name': 'Books', 'type': 'CRUD', 'config': {'table': 'books', 'fields': [
+        {'name': 'genre', 'type': 'string'}, {'name': 'pages', 'type': 'integer'},
+    ]}}
+    authors = {'name': 'Authors', 'type': 'CRUD', 'config': {'table': 'authors', 'fields': [
+        {'name': 'country', 'type': 'string'},
+    ]}}
+    analytics = {'name': 'Stats', 'type': 'ANALYTICS', 'config': {'reports': [
+        {'name': 'books', 'entity': 'books', 'type': 'count'},
+        {'name': 'pages', 'entity': 'books', 'type': 'sum', 'field': 'pages'},
+        {'name': 'avg_pages', 'entity': 'books', 'mode': 'advanced', 'expression': 'sum(pages) / count(id)'},
+        {'name': 'authors', 'entity': 'authors', 'type': 'count'},
+        {'name': 'by_genre', 'entity': 'books', 'type': 'count', 'group_by': 'genre'},
+        {'name': 'by_country', 'entity': 'authors', 'type': 'count', 'group_by': 'country'},
+    ]}}
+    result = _run_generated(tmp_path, [books, authors, analytics], """
+        from sqlalchemy import event
+        for genre, pages in [('sf', 100), ('sf', 300), ('crime', 200)]:
+            client.post('/api/books', json={'genre': genre, 'pages': pages})
+        client.post('/api/authors', json={'country': 'MA'})
+        statements = []
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        summary = client.get('/api/analytics/summary').json
+        print(json.dumps({'summary': summary, 'queries': len(statements)}))
+    """)
+
+    assert result['summary'] == {
+        'books': 3, 'pages': 600, 'avg_pages': 200, 'authors': 1,
+        'by_genre': {'sf': 2, 'crime': 1}, 'by_country': {'MA': 1},
+    }
+    assert result['queries'] == 2
+
+
+def test_generated_cache_serves_etags_and_invalidates(tmp_path):
+    books = {'name': 'Books', 'type': 'CRUD', 'config': {'table': 'books', 'cache': {'ttl': 30}, 'fields': [
+        {'name': 'title', 'type': 'string'},
+    ]}}
+    analytics = {'name': 'Stats', 'type': 'ANALYTICS', 'config': {'cache': True, 'reports': [
+        {'name': 'books', 'entity': 'books', 'type': 'count'},
+    ]}}
+    result = _run_generated(tmp_path, [books, analytics], """
+        from sqlalchemy import event
+        statements = []
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', lambda *args: statements.append(args[2]))
+        first = client.get('/api/books')
+        queries_first = len(statements)
+        second = client.get('/api/books')
+        queries_second = len(statements)
+        not_modified = client.get('/api/books', headers={'If-None-Match': first.headers['ETag']})
+        summary_before = client.get('/api/analytics/summary').json
+        client.post('/api/books', json={'title': 'Dune'})
+        after_write = client.get('/api/books', headers={'If-None-Match': first.headers['ETag']})
+        summary_after = client.get('/api/analytics/summary').json
+        print(json.dumps({
+            'cached_without_queries': queries_second == queries_first,
+            'same_etag': first.headers['ETag'] == second.headers['ETag'],
+            'not_modified': not_modified.status_code,
+            'after_write': [after_write.status_code, len(after_write.json['items'])],
+            'summaries': [summary_before['books'], summary_after['books']],
+        }))
+    """)
+
+    assert result['cached_without_queries'] is True
+    assert result['same_etag'] is True
+    assert result['not_modified'] == 304
+    assert result['after_write'] == [200, 1]
+    assert result['summaries'] == [0, 1]
+    files = GeneratorService.get_project_files(PROJECT_INFO, [books])
+    assert 'redis==' in files['requirements.txt']
+    assert 'app/cache.py' not in GeneratorService.get_project_files(PROJECT_INFO, FEATURES)
+
+
+def test_generated_bulk_routes(tmp_path):
+    books = {'name': 'Books', 'type': 'CRUD', 'config': {'table': 'books', 'max_batch_size': 3, 'fields': [
+        {'name': 'title', 'type': 'string', 'required': True}, {'name': 'pages', 'type': 'integer'},
+    ]}}
+    result = _run_generated(tmp_path, [books], """
+        created = client.post('/api/books/bulk', json={'items': [{'title': 'A'}, {'title': 'B', 'pages': 3}]})
+        too_many = client.post('/api/books/bulk', json=[{'title': 'x'}] * 4)
+        missing = client.post('/api/books/bulk', json=[{'title': 'x'}, {'pages': 1}])
+        deleted = client.delete('/api/books/bulk', json={'ids': created.json['ids'][:1] + [999]})
+        remaining = client.get('/api/books').json['items']
+        print(json.dumps({
+            'created': [created.status_code, created.json],
+            'too_many': too_many.status_code,
+            'missing': [missing.status_code, missing.json['index']],
+            'deleted': deleted.json,
+            'remaining': [i['title'] for i in remaining],
+        }))
+    """)
+
+    assert result['created'] == [201, {'created': 2, 'ids': [1, 2]}]
+    assert result['too_many'] == 413
+    assert result['missing'] == [400, 1]
+    assert result['deleted'] == {'deleted': 1}
+    assert result['remaining'] == ['B']
+
+
+def test_production_profile(tmp_path):
+    info = {'name': 'Prod', 'options': {'profile': 'production'}}
+    files = GeneratorService.get_project_files(info, FEATURES)
+    assert {'gunicorn.conf.py', 'Dockerfile', '.dockerignore'} <= set(files)
+    assert 'gunicorn==' in files['requirements.txt']
+    assert 'debug=True' not in files['run.py']
+    assert 'gunicorn.conf.py' not in GeneratorService.get_project_files(PROJECT_INFO, FEATURES)
+
+    namespace = {}
+    exec(compile(files['gunicorn.conf.py'], 'gunicorn.conf.py', 'exec'), namespace)
+    assert namespace['workers'] >= 3 and namespace['worker_class'] == 'gthread'
+
+    (tmp_path / 'config.py').write_text(files['app/config.py'])
+    import subprocess, sys, json
+    script = ("import json, config; print(json.dumps([config.engine_options('postgresql://db/x'), "
+              "config.engine_options('sqlite:///app.db')]))")
+    proc = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, capture_output=True, text=True,
+                          env={'GUNICORN_THREADS': '3', 'DB_STATEMENT_TIMEOUT_MS': '2500', 'PATH': ''})
+    assert proc.returncode == 0, proc.stderr
+    postgres, sqlite = json.loads(proc.stdout)
+    assert postgres['pool_size'] == 3 and postgres['max_overflow'] == 3 and postgres['pool_pre_ping'] is True
+    assert postgres['connect_args'] == {'options': '-c statement_timeout=2500'}
+    assert sqlite == {}
+
+
+def test_production_profile_boots_under_gunicorn_hooks(tmp_path):
+    """Loaded as gunicorn does (config hooks, then run:app) the schema exists without run.py's __main__"""
+    import json
+    import subprocess
+    import sys
+    import textwrap
+
+    info = {'name': 'Prod', 'options': {'profile': 'production'}}
+    _write_project(tmp_path, [f for f in FEATURES if f['type'] == 'CRUD'], info)
+    script = textwrap.dedent("""
+        import json
+        conf = {}
+        exec(open('gunicorn.conf.py').read(), conf)
+        conf['on_starting'](None)
+        from run import app
+        client = app.test_client()
+        created = client.post('/api/books', json={'title': 'Dune'})
+        print(json.dumps([created.status_code, client.get('/api/books').json['items']]))
+    """)
+    proc = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, capture_output=True, text=True, timeout=60,
+                          env={'DATABASE_URL': f"sqlite:///{tmp_path / 'prod.db'}", 'PATH': ''})
+    assert proc.returncode == 0, proc.stderr
+    status, items = json.loads(proc.stdout.strip().splitlines()[-1])
+    assert status == 201 and [i['title'] for i in items] == ['Dune']
+
+
+def test_generated_bench_harness(tmp_path):
+    """bench/run.py seeds data and drives every generated route against local SQLite"""
+    import json
+    import subprocess
+    import sys
+
+    _write_project(tmp_path, FEATURES)
+    proc = subprocess.run(
+        [sys.executable, 'bench/run.py', '--requests', '3', '--concurrency', '2', '--warmup', '1', '--json', '-'],
+        cwd=tmp_path, capture_output=True, text=True, timeout=120
+    )
+    assert proc.returncode == 0, proc.stderr
+    results = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    assert set(results) == {
+        'POST /api/auth/register', 'POST /api/auth/login', 'GET /api/auth/me',
+        'GET /api/books', 'GET /api/books/<id>', 'POST /api/books', 'POST /api/books/bulk',
+        'DELETE /api/books/<id>', 'DELETE /api/books/bulk', 'POST /api/greet', 'GET /api/analytics/summary',
+    }
+    for stats in results.values():
+        assert stats['requests'] == 3 and stats['errors'] == 0
+        assert stats['p50_ms'] <= stats['p95_ms'] <= stats['p99_ms']
+
+
+def test_generated_modules_have_no_unused_imports():
+    """Top-level imports of the generated support modules are all referenced"""
+    import ast
+
+    features = FEATURES + [{'name': 'Notes', 'type': 'CRUD', 'config': {
+        'table': 'notes', 'cache': True, 'fields': [{'name': 'body', 'type': 'string'}]
+    }}]
+    files = GeneratorService.get_project_files(PROJECT_INFO, features)
+    for path in ['app/cache.py', 'bench/run.py', 'bench/scenarios.py']:
+        tree = ast.parse(files[path])
+        imported = {
+            (alias.asname or alias.name).split('.')[0]
+            for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))
+            for alias in node.names
+        }
+        used = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+        assert imported <= used, f"{path}: unused {sorted(imported - used)}"
+
+
+def test_generated_metrics_endpoint(tmp_path):
+    features = [f for f in FEATURES if f['type'] in ('CRUD', 'FUNCTIONS')]
+    info = {'name': 'Book Store', 'options': {'instrumentation': True}}
+    result = _run_generated(tmp_path, features, """
+        for i in range(3):
+            client.post('/api/books', json={'title': f'Book {i}'})
+        client.get('/api/books')
+        client.get('/api/books/99')
+        client.post('/api/greet', json={'name': 'Ann'})
+        response = client.get('/metrics')
+        app.config['METRICS_TOKEN'] = 'secret'
+        denied = client.get('/metrics').status_code
+        allowed = client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code
+        print(json.dumps({'mimetype': response.mimetype, 'body': response.get_data(as_text=True),
+                          'denied': denied, 'allowed': allowed}))
+    """, info)
+
+    body = result['body']
+    assert result['mimetype'] == 'text/plain'
+    assert 'http_requests_total{method="POST",route="/api/books",status="201"} 3' in body
+    assert 'http_requests_total{method="GET",route="/api/books/<int:id>",status="404"} 1' in body
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/books"} 1' in body
+    assert 'http_request_db_queries_bucket{method="POST",route="/api/greet",le="0"} 1' in body
+    assert 'db_queries_total{method="POST",route="/api/books"} ' in body
+    assert 'route="/metrics"' not in body
+    assert (result['denied'], result['allowed']) == (401, 200)
+
+    asgi = GeneratorService.get_project_files({'options': {'instrumentation': True, 'target': 'asgi'}}, features)
+    assert 'async def record_request' in asgi['app/metrics.py']
+    assert 'init_metrics(app)' in asgi['app/__init__.py']
+    assert 'app/metrics.py' not in GeneratorService.get_project_files(PROJECT_INFO, features)
+
+
+def test_generated_fast_json_provider(tmp_path):
+    features = [{'name': 'Events', 'type': 'CRUD', 'config': {'table': 'events', 'fields': [
+        {'name': 'title', 'type': 'string'}, {'name': 'at', 'type': 'datetime'},
+    ]}}]
+    info = {'name': 'Book Store', 'options': {'fast_json': True}}
+    files = GeneratorService.get_project_files(info, features)
+    assert 'orjson==' in files['requirements.txt']
+    # Same module the platform itself serves JSON with
+    from app.utils import json_provider
+    with open(json_provider.__file__, encoding='utf-8') as fh:
+        assert files['app/json_provider.py'] == fh.read()
+    result = _run_generated(tmp_path, features, """
+        from app.json_provider import FastJSONProvider
+        client.post('/api/events', json={'title': 'Launch'})
+        response = client.get('/api/events')
+        print(json.dumps({'provider': isinstance(app.json, FastJSONProvider), 'body': response.json}))
+    """, info)
+
+    assert result['provider'] is True
+    assert result['body']['items'][0]['title'] == 'Launch'
+    assert 'app/json_provider.py' not in GeneratorService.get_project_files(PROJECT_INFO, features)
+
+
+ASGI_INFO = {'name': 'Book Store', 'options': {'target': 'asgi'}}
+
+
+def test_asgi_target_files():
+    files = GeneratorService.get_project_files(ASGI_INFO, FEATURES)
+    assert 'Quart' in files['requirements.txt'] and 'Flask-SQLAlchemy' not in files['requirements.txt']
+    assert {'app/database.py', 'app/security.py', 'app/functions/greet.py', 'bench/run.py'} <= set(files)
+    assert files['app/models/crud.py'] == GeneratorService.get_project_files(PROJECT_INFO, FEATURES)['app/models/crud.py']
+    for path, content in files.items():
+        if path.endswith('.py'):
+            compile(content, path, 'exec')
+
+    with pytest.raises(ValueError):
+        GeneratorService.get_project_files({'options': {'target': 'tornado'}}, FEATURES)
+
+
+def test_asgi_target_runs(tmp_path):
+    """Async routes cover auth, CRUD, bulk, cache, analytics and sync/async function handlers"""
+    import json
+    import subprocess
+    import sys
+    import textwrap
+
+    books = {'name': 'Books', 'type': 'CRUD', 'config': {'table': 'books', 'cache': True, 'fields': [
+        {'name': 'title', 'type': 'string', 'required': True},
+        {'name': 'pages', 'type': 'integer'},
+    ]}}
+    tick = {'name': 'Tick', 'type': 'FUNCTIONS', 'config': {
+        'name': 'tick', 'code': "import asyncio\n\nasync def handler(input_data):\n    await asyncio.sleep(0)\n    return {'async': True}"
+    }}
+    _write_project(tmp_path, [FEATURES[0], books, FEATURES[2], FEATURES[3], tick], ASGI_INFO)
+
+    script = textwrap.dedent("""
+        import asyncio, json
+        from app import create_app, db
+        from app.config import Config
+
+        class TestConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
+            TESTING = True
+
+        async def main():
+            app = create_app(TestConfig)
+            await db.create_all()
+            client = app.test_client()
+            await client.post('/api/auth/register', json={'email': 'a@example.com', 'password': 'pw', 'username': 'ann'})
+            login = await (await client.post('/api/auth/login', json={'email': 'a@example.com', 'password': 'pw'})).get_json()
+            headers = {'Authorization': f"Bearer {login['token']}"}
+
+            for i in range(3):
+                await client.post('/api/books', json={'title': f'Book {i}', 'pages': i}, headers=headers)
+            bulk = await (await client.post('/api/books/bulk', json={'items': [{'title': 'X'}, {'title': 'Y'}]}, headers=headers)).get_json()
+            page = await client.get('/api/books?limit=2', headers=headers)
+            etag = page.headers['ETag']
+            not_modified = await client.get('/api/books?limit=2', headers={**headers, 'If-None-Match': etag})
+            deleted = await (await client.delete('/api/books/bulk', json={'ids': bulk['ids']}, headers=headers)).get_json()
+            missing = await client.get('/api/books/999', headers=headers)
+            print(json.dumps({
+                'me': (await (await client.get('/api/auth/me', headers=headers)).get_json())['username'],
+                'page': await page.get_json(),
+                'not_modified': not_modified.status_code,
+                'deleted': deleted['deleted'],
+                'missing': missing.status_code,
+                'unauthorized': (await client.get('/api/books')).status_code,
+                'summary': await (await client.get('/api/analytics/summary')).get_json(),
+                'greet': await (await client.post('/api/greet', json={'name': 'Ann'})).get_json(),
+                'tick': await (await client.post('/api/tick', json={})).get_json(),
+            }))
+            await db.engine.dispose()
+
+        asyncio.run(main())
+    """)
+    proc = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    assert result['me'] == 'ann'
+    assert [i['title'] for i in result['page']['items']] == ['Book 0', 'Book 1']
+    assert result['page']['has_more'] is True
+    assert result['not_modified'] == 304
+    assert result['deleted'] == 2
+    assert result['missing'] == 404
+    assert result['unauthorized'] == 401
+    assert result['summary'] == {'total_books': 3}
+    assert result['greet'] == {'hello': 'Ann'}
+    assert result['tick'] == {'async': True}
+
+
+def test_asgi_cache_awaits_redis(tmp_path):
+    """The async cache talks to Redis through redis.asyncio (a fake coroutine client here)"""
+    import json
+    import subprocess
+    import sys
+    import textwrap
+
+    books = {'name': 'Books', 'type': 'CRUD', 'config': {'table': 'books', 'cache': True, 'fields': [
+        {'name': 'title', 'type': 'string', 'required': True},
+    ]}}
+    _write_project(tmp_path, [books], ASGI_INFO)
+    assert 'import redis.asyncio as redis' in (tmp_path / 'app' / 'cache.py').read_text()
+
+    script = textwrap.dedent("""
+        import asyncio, json, sys, types
+
+        class FakeRedis:
+            calls = []
+
+            def __init__(self):
+                self.data = {}
+
+            @classmethod
+            def from_url(cls, url):
+                return cls()
+
+            async def get(self, key):
+                FakeRedis.calls.append('get')
+                return self.data.get(key)
+
+            async def set(self, key, value, ex=None):
+                FakeRedis.calls.append('set')
+                self.data[key] = value
+
+            async def incr(self, key):
+                FakeRedis.calls.append('incr')
+                self.data[key] = int(self.data.get(key) or 0) + 1
+
+        fake = types.ModuleType('redis.asyncio')
+        fake.Redis = FakeRedis
+        sys.modules['redis'] = types.ModuleType('redis')
+        sys.modules['redis'].asyncio = fake
+        sys.modules['redis.asyncio'] = fake
+
+        from app import create_app, db
+        from app.config import Config
+
+        class TestConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///test.db'
+            REDIS_URL = 'redis://cache'
+
+        async def main():
+            app = create_app(TestConfig)
+            await db.create_all()
+            client = app.test_client()
+            first = await client.get('/api/books')
+            cached = await client.get('/api/books', headers={'If-None-Match': first.headers['ETag']})
+            await client.post('/api/books', json={'title': 'Dune'})
+            fresh = await client.get('/api/books')
+            print(json.dumps([cached.status_code, len((await fresh.get_json())['items']), sorted(set(FakeRedis.calls))]))
+            await db.engine.dispose()
+
+        asyncio.run(main())
+    """)
+    proc = subprocess.run([sys.executable, '-c', script], cwd=tmp_path, capture_output=True, text=True, timeout=60)
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(proc.stdout.strip().splitlines()[-1]) == [304, 1, ['get', 'incr', 'set']]
@@ -0,0 +1,54 @@
+import decimal
+import json
+import uuid
+from datetime import datetime
+import pytest
+from flask import jsonify
+from app.utils import json_provider
+from app.utils.json_provider import FastJSONProvider
+
+PAYLOAD = {
+    'b': decimal.Decimal('10.50'),
+    'a': datetime(2024, 5, 1, 12, 30, 15, 250),
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+}
+EXPECTED = {
+    'a': '2024-05-01T12:30:15.000250',
+    'b': '10.50',
+    'id': '12345678-1234-5678-1234-567812345678',
+}
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def serializer(request, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    elif json_provider.orjson is None:
+        pytest.skip('orjson is not installed')
+    return request.param
+
+
+def test_app_uses_fast_provider(app):
+    assert isinstance(app.json, FastJSONProvider)
+
+
+def test_jsonify_handles_native_types(app, serializer):
+    with app.test_request_context():
+        response = jsonify(PAYLOAD)
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == EXPECTED
+    # Keys stay sorted, as with Flask's default provider
+    assert list(json.loads(response.get_data())) == sorted(EXPECTED)
+
+
+def test_dumps_and_loads_round_trip(app, serializer):
+    text = app.json.dumps(PAYLOAD)
+    assert isinstance(text, str)
+    assert app.json.loads(text) == EXPECTED
+    assert app.json.loads(app.json.dumps({2: 'b', 1: 'a'})) == {'1': 'a', '2': 'b'}
+    assert app.json.loads(app.json.dumps([2 ** 70])) == [2 ** 70]
+
+
+def test_unknown_types_raise(app, serializer):
+    with pytest.raises(TypeError):
+        app.json.dumps({'value': object()})
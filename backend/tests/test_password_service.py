@@ -0,0 +1,71 @@
+import threading
+import time
+from flask_jwt_extended import create_access_token
+from app import db
+from app.models import User, Role
+from app.services.password_service import PasswordHasher, password_hasher
+from app.services.features.auth import AuthHandler
+
+
+def test_hasher_uses_configured_work_factors():
+    hasher = PasswordHasher(rounds=5, test_rounds=4, max_workers=2)
+    hashed = hasher.hash('secret')
+    assert hashed.startswith('$2b$05$')
+    assert hasher.hash_test('secret').startswith('$2b$04$')
+    assert hasher.verify('secret', hashed)
+    assert not hasher.verify('wrong', hashed)
+    assert not hasher.verify('secret', None)
+
+    metrics = hasher.metrics()
+    assert (metrics['hash']['count'], metrics['verify']['count']) == (2, 2)
+    assert metrics['hash']['p95_ms'] >= metrics['hash']['p50_ms'] > 0
+
+
+def test_hasher_bounds_concurrent_hashes(monkeypatch):
+    hasher = PasswordHasher(rounds=4, test_rounds=4, max_workers=2)
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def slow_hashpw(password, salt):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return b'$2b$04$' + b'x' * 53
+
+    monkeypatch.setattr('app.services.password_service.bcrypt.hashpw', slow_hashpw)
+    threads = [threading.Thread(target=hasher.hash, args=('secret',)) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
+
+
+def test_app_config_drives_shared_hasher(app):
+    assert (password_hasher.rounds, password_hasher.test_rounds) == (4, 4)
+    user = User(email='hash@example.com', first_name='Ha', last_name='Sh', role_id=1)
+    user.set_password('Test123!')
+    assert user.password_hash.startswith('$2b$04$')
+    assert user.check_password('Test123!')
+
+    result, status = AuthHandler().handle('POST', '/api/auth/register', {'email': 'a@example.com', 'password': 'pw'}, {}, {})
+    assert status == 201
+
+
+def test_password_metrics_endpoint_is_admin_only(app, client):
+    roles = {r.name: r for r in Role.query.all()}
+    users = {}
+    for name in ('admin', 'user'):
+        user = User(email=f'{name}@example.com', first_name=name, last_name='x', role_id=roles[name].id)
+        user.set_password('Test123!')
+        db.session.add(user)
+        db.session.commit()
+        users[name] = create_access_token(identity=str(user.id))
+
+    response = client.get('/api/auth/metrics/password-hashing', headers={'Authorization': f"Bearer {users['user']}"})
+    assert response.status_code == 403
+    response = client.get('/api/auth/metrics/password-hashing', headers={'Authorization': f"Bearer {users['admin']}"})
+    assert response.status_code == 200
+    assert response.json['rounds'] == 4 and response.json['hash']['count'] >= 2
@@ -0,0 +1,112 @@
+import pytest
+from app import db
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from app.models.test_record import TestRecord as Record, json_text, AUTH_SCOPE
+from app.services.features.auth import AuthHandler
+from app.services.features.crud import CRUDHandler
+
+BOOKS = {'table': 'books', 'fields': [{'name': 'title', 'type': 'string', 'required': True}]}
+CONTEXT = {'user_id': 1, 'project_id': '1'}
+
+
+def _plan(query):
+    sql = str(query.statement.compile(db.engine, compile_kwargs={'literal_binds': True}))
+    return ' '.join(row[-1] for row in db.session.execute(db.text('EXPLAIN QUERY PLAN ' + sql)))
+
+
+def test_record_id_lookup_uses_expression_index(app):
+    query = Record.query.filter(Record.project_id == '1', Record.feature_id == 'f', json_text(Record.data, 'id') == '3')
+    assert 'USING INDEX ix_test_records_scope_record_id' in _plan(query)
+
+
+def test_auth_identity_lookup_uses_unique_indexes(app):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    AuthHandler._find_users('auth_test_1', '1', {'email': 'a', 'username': 'b'})
+    event.remove(db.engine, 'before_cursor_execute', record)
+
+    assert len(statements) == 1
+    statement, parameters = statements[0]
+    plan = ' '.join(row[-1] for row in db.session.connection().exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters))
+    assert 'USING INDEX uq_test_records_auth_email' in plan
+    assert 'USING INDEX uq_test_records_auth_username' in plan
+
+
+def test_json_text_matches_numbers_and_strings(app):
+    db.session.add_all([
+        Record(project_id='1', feature_id='f', data={'id': 3}),
+        Record(project_id='1', feature_id='f', data={'id': '4'}),
+    ])
+    db.session.commit()
+    assert Record.query.filter(json_text(Record.data, 'id') == '3').count() == 1
+    assert Record.query.filter(json_text(Record.data, 'id') == '4').count() == 1
+    with pytest.raises(ValueError):
+        json_text(Record.data, "id') OR 1=1 --")
+
+
+def test_crud_handler_id_routes(app):
+    handler = CRUDHandler()
+    for title in ('Dune', 'Emma'):
+        handler.handle('POST', '/api/books', {'title': title}, BOOKS, CONTEXT)
+
+    result, status = handler.handle('GET', '/api/books/2', {}, BOOKS, CONTEXT)
+    assert (status, result['data']) == (200, {'title': 'Emma', 'id': 2})
+    assert handler.handle('DELETE', '/api/books/1', {}, BOOKS, CONTEXT)[1] == 200
+    assert handler.handle('GET', '/api/books/1', {}, BOOKS, CONTEXT)[1] == 404
+    assert handler.handle('PUT', '/api/books', {'id': 9, 'title': 'X'}, BOOKS, CONTEXT)[1] == 404
+
+
+def test_auth_login_looks_up_by_email_or_username(app):
+    handler = AuthHandler()
+    schema = {'extra_fields': ['username']}
+    body = {'email': 'a@example.com', 'password': 'secret', 'username': 'ann'}
+    assert handler.handle('POST', '/api/auth/register', dict(body), schema, CONTEXT)[1] == 201
+    assert handler.handle('POST', '/api/auth/register', dict(body, email='b@example.com'), schema, CONTEXT)[0] == {
+        'error': 'Username already exists'
+    }
+
+    assert handler.handle('POST', '/api/auth/login', {'email': 'a@example.com', 'password': 'secret'}, schema, CONTEXT)[1] == 200
+    result, status = handler.handle('POST', '/api/auth/login', {'email': 'x', 'username': 'ann', 'password': 'secret'}, schema, CONTEXT)
+    assert status == 200 and result['user']['email'] == 'a@example.com'
+    assert handler.handle('POST', '/api/auth/login', {'email': 'x', 'password': 'secret'}, schema, CONTEXT)[1] == 401
+
+
+def test_auth_identities_are_unique_in_the_database(app):
+    db.session.add(Record(project_id='1', feature_id='auth_test_1', data={'email': 'a@example.com'}))
+    db.session.commit()
+    db.session.add(Record(project_id='1', feature_id='auth_test_1', data={'email': 'a@example.com'}))
+    with pytest.raises(IntegrityError):
+        db.session.commit()
+    db.session.rollback()
+
+    # Other scopes and CRUD records are unaffected
+    db.session.add_all([
+        Record(project_id='2', feature_id='auth_test_1', data={'email': 'a@example.com'}),
+        Record(project_id='1', feature_id='crud_1_people', data={'email': 'a@example.com'}),
+        Record(project_id='1', feature_id='crud_1_people', data={'email': 'a@example.com'}),
+    ])
+    db.session.commit()
+
+
+def test_auth_register_reports_lost_race(app, monkeypatch):
+    handler = AuthHandler()
+    body = {'email': 'a@example.com', 'password': 'secret'}
+    assert handler.handle('POST', '/api/auth/register', dict(body), {}, CONTEXT)[1] == 201
+
+    # Simulate a concurrent request that passed the pre-check before the first one committed
+    original = AuthHandler._conflicting_field.__func__
+    checks = []
+
+    def racing_check(cls, *args):
+        checks.append(args)
+        return None if len(checks) == 1 else original(cls, *args)
+
+    monkeypatch.setattr(AuthHandler, '_conflicting_field', classmethod(racing_check))
+    assert handler.handle('POST', '/api/auth/register', dict(body), {}, CONTEXT) == ({'error': 'Email already exists'}, 400)
+    assert len(checks) == 2
+    assert Record.query.count() == 1
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models import User, Role, Project
+from app.models.test_record import TestRecord as Record
+from app.services.project_service import ProjectService
+from app.services.retention_service import RetentionService
+
+
+@pytest.fixture
+def projects(app):
+    role = Role.query.filter_by(name='user').first()
+    user = User(email='retention@example.com', first_name='Re', last_name='Tain', role_id=role.id)
+    user.set_password('Test123!')
+    db.session.add(user)
+    db.session.flush()
+    projects = [
+        Project(name='Default', owner_id=user.id, api_key='r1'),
+        Project(name='Short', owner_id=user.id, api_key='r2', test_data_ttl_days=1),
+        Project(name='Forever', owner_id=user.id, api_key='r3', test_data_ttl_days=0),
+    ]
+    db.session.add_all(projects)
+    db.session.flush()
+
+    now = datetime.utcnow()
+    for project in projects:
+        for age in (0, 3, 10):
+            db.session.add(Record(
+                project_id=str(project.id), feature_id='crud_1_books', data={'age': age}, created_at=now - timedelta(days=age)
+            ))
+    db.session.commit()
+    return projects
+
+
+def _ages(project):
+    return sorted(r.data['age'] for r in Record.query.filter_by(project_id=str(project.id)))
+
+
+def test_purge_honours_project_ttls(projects):
+    default, short, forever = projects
+    assert RetentionService.purge_test_records(7, batch_size=1) == 3
+    assert _ages(default) == [0, 3]
+    assert _ages(short) == [0]
+    assert _ages(forever) == [0, 3, 10]
+
+
+def test_purge_with_default_disabled(projects):
+    assert RetentionService.purge_test_records(0) == 2
+    assert _ages(projects[0]) == [0, 3, 10]
+
+
+def test_project_delete_purges_test_records(projects):
+    project = projects[0]
+    assert ProjectService.delete_project(project.id, project.owner_id)[1] == 200
+    assert _ages(project) == []
+    assert _ages(projects[1]) == [0, 3, 10]
+
+
+def test_update_project_ttl(projects):
+    project = projects[0]
+    assert ProjectService.update_project(project.id, project.owner_id, test_data_ttl_days=30)[0]['project']['test_data_ttl_days'] == 30
+    assert ProjectService.update_project(project.id, project.owner_id, test_data_ttl_days=-1)[1] == 400
+
+
+def test_purge_cli(app, runner, projects):
+    result = runner.invoke(args=['purge-test-records'])
+    assert result.exit_code == 0, result.output
+    assert 'Purged 3 test record(s)' in result.output
+
+    result = runner.invoke(args=['purge-test-records', '--project', str(projects[2].id)])
+    assert 'Purged 3 test record(s)' in result.output
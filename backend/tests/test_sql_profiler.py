@@ -0,0 +1,102 @@
+import logging
+import pytest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.models import User, Role, Project
+from app.utils.sql_profiler import fingerprint, profile_queries, assert_max_queries
+from config.settings import TestingConfig
+
+
+def _owner():
+    role = Role.query.filter_by(name='user').first()
+    user = User(email='profiler@example.com', first_name='Pro', last_name='Filer', role_id=role.id)
+    user.set_password('Test123!')
+    db.session.add(user)
+    db.session.flush()
+    db.session.add_all([Project(name=f'P{i}', owner_id=user.id, api_key=f'prof-{i}') for i in range(8)])
+    db.session.commit()
+    return user.id
+
+
+def test_fingerprint_normalizes_literals_and_in_lists():
+    assert fingerprint("SELECT * FROM t WHERE id IN (?, ?, ?) AND name = 'x''y'") == fingerprint(
+        "SELECT *\n  FROM t WHERE id IN (?) AND name = 'z'"
+    )
+    assert fingerprint('SELECT a FROM t WHERE a = %(a_1)s::VARCHAR LIMIT 10') == 'SELECT a FROM t WHERE a = ?::VARCHAR LIMIT ?'
+
+
+def test_profile_flags_repeated_selects(app):
+    user_id = _owner()
+    with profile_queries() as profile:
+        for project in Project.query.filter_by(owner_id=user_id).all():
+            project.features.count()
+    assert profile.count == 9
+    (fp, n), = profile.repeated(threshold=5)
+    assert n == 8 and 'FROM features' in fp
+
+
+def test_failed_statements_leave_no_state_on_the_connection(app):
+    from sqlalchemy import text
+    from sqlalchemy.exc import OperationalError
+
+    with profile_queries() as profile:
+        with db.engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text('SELECT * FROM missing_table'))
+            conn.execute(text('SELECT 1'))
+            assert 'sql_profiler_start' not in conn.info
+    assert profile.count == 1
+
+
+def test_assert_max_queries(app):
+    _owner()
+    with assert_max_queries(1):
+        Project.query.all()
+    with pytest.raises(AssertionError, match='Expected at most 1 queries, 2 ran'):
+        with assert_max_queries(1):
+            Project.query.all()
+            Project.query.count()
+
+
+def test_endpoint_query_budget(app, client):
+    token = create_access_token(identity=str(_owner()))
+    with assert_max_queries(1):
+        response = client.get('/api/projects', headers={'Authorization': f'Bearer {token}'})
+    assert len(response.json['projects']) == 8
+
+
+@pytest.fixture
+def profiled_app(monkeypatch):
+    monkeypatch.setattr(TestingConfig, 'SQL_PROFILER', True)
+    monkeypatch.setattr(TestingConfig, 'SQL_PROFILER_N_PLUS_ONE_THRESHOLD', 3)
+    app = create_app('testing')
+    with app.app_context():
+        db.create_all()
+        db.session.add(Role(name='user', description='Regular user'))
+        db.session.commit()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+def test_middleware_reports_queries_and_n_plus_one(profiled_app, caplog):
+    user_id = _owner()
+
+    @profiled_app.route('/per-row')
+    def per_row():
+        return {'counts': [p.features.count() for p in Project.query.filter_by(owner_id=user_id)]}
+
+    client = profiled_app.test_client()
+    token = create_access_token(identity=str(user_id))
+    response = client.get('/api/projects', headers={'Authorization': f'Bearer {token}'})
+    assert response.headers['X-Query-Count'] == '1'
+    assert 'X-Query-N-Plus-One' not in response.headers
+
+    with caplog.at_level(logging.INFO):
+        response = client.get('/per-row')
+    assert response.headers['X-Query-Count'] == '9'
+    assert float(response.headers['X-Query-Time-Ms']) > 0
+    assert response.headers['X-Query-N-Plus-One'] == '1'
+    assert 'GET /per-row: 9 queries' in caplog.text
+    assert 'Possible N+1 on GET /per-row' in caplog.text
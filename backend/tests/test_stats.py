@@ -0,0 +1,149 @@
+import pytest
+from app import db
+from app.models import User, Role, Project, Feature, CustomFunction
+from app.models.api_request_log import ApiRequestLog
+from app.models.test_record import TestRecord as Record
+from app.services.project_service import ProjectService
+from app.services.usage_service import UsageService
+from app.utils.sql_profiler import profile_queries
+
+
+@pytest.fixture
+def owner(app):
+    role = Role.query.filter_by(name='user').first()
+    user = User(email='stats@example.com', first_name='St', last_name='Ats', role_id=role.id)
+    user.set_password('Test123!')
+    db.session.add(user)
+    db.session.flush()
+
+    projects = [
+        Project(name='Done', owner_id=user.id, status='completed', api_key='k1'),
+        Project(name='Draft', owner_id=user.id, status='draft', api_key='k2'),
+        Project(name='Gone', owner_id=user.id, status='deleted', api_key='k3'),
+    ]
+    db.session.add_all(projects)
+    db.session.flush()
+    books = Feature(project_id=projects[0].id, name='Books', feature_type='CRUD', configuration={})
+    db.session.add_all([
+        books,
+        Feature(project_id=projects[0].id, name='Auth', feature_type='AUTH', configuration={}),
+        Feature(project_id=projects[1].id, name='Events', feature_type='ANALYTICS', configuration={}),
+        CustomFunction(project_id=projects[1].id, name='totals', endpoint_path='/totals'),
+        Record(project_id=str(projects[0].id), feature_id='crud_1_books', data={'id': 1}),
+    ])
+    db.session.flush()
+    for _ in range(3):
+        log = ApiRequestLog(project_id=projects[0].id, feature_id=books.id, method='GET', path='books', status_code=200)
+        db.session.add(log)
+        UsageService.record(log)
+    db.session.commit()
+    return user.id
+
+
+@pytest.fixture
+def queries(app):
+    with profile_queries() as profile:
+        yield profile.statements
+
+
+def test_user_stats_totals(owner, queries):
+    stats, status = ProjectService.get_user_stats(owner)
+    assert status == 200
+    assert len(queries) == 5
+    assert stats['totalProjects'] == 3
+    assert (stats['completedProjects'], stats['draftProjects'], stats['deletedProjects']) == (1, 1, 1)
+    assert stats['featuresByType'] == {'CRUD': 1, 'Auth': 1, 'Functions': 1, 'Analytics': 1}
+    assert stats['totalFeatures'] == 4
+    assert stats['totalApis'] == 16
+    assert stats['totalTests'] == 1
+    assert stats['totalExternalTests'] == 3
+    assert stats['apiUsageByFeature'] == {'Books': 3}
+    assert sum(day['count'] for day in stats['apiUsageByDay']) == 3
+
+
+def test_user_stats_without_projects(app, queries):
+    stats, _ = ProjectService.get_user_stats(12345)
+    assert len(queries) == 1
+    assert stats['totalProjects'] == 0
+    assert stats['apiUsageByDay'] == [] and stats['apiUsageByFeature'] == {}
+
+
+def test_user_stats_snapshot_is_reused_until_a_write(owner, queries):
+    first, _ = ProjectService.get_user_stats(owner)
+    assert ProjectService.get_user_stats(str(owner))[0] is first
+    assert len(queries) == 5
+
+    project = Project.query.filter_by(owner_id=owner, name='Draft').first()
+    log = ApiRequestLog(project_id=project.id, method='POST', path='totals', status_code=200)
+    db.session.add(log)
+    UsageService.record(log)
+    db.session.commit()
+
+    stats, _ = ProjectService.get_user_stats(owner)
+    assert stats['totalExternalTests'] == 4
+
+
+def test_user_stats_snapshot_is_dropped_on_commit_not_flush(owner):
+    first, _ = ProjectService.get_user_stats(owner)
+    project = Project.query.filter_by(owner_id=owner, name='Draft').first()
+    db.session.add(CustomFunction(project_id=project.id, name='extra', endpoint_path='/extra'))
+    db.session.flush()
+    assert ProjectService.get_user_stats(owner)[0] is first
+
+    db.session.rollback()
+    assert ProjectService.get_user_stats(owner)[0] is first
+
+    db.session.add(CustomFunction(project_id=project.id, name='extra', endpoint_path='/extra'))
+    db.session.commit()
+    assert ProjectService.get_user_stats(owner)[0] is not first
+
+
+def test_user_stats_snapshot_is_dropped_by_bulk_purges(app, owner):
+    from app.services.retention_service import RetentionService
+
+    first, _ = ProjectService.get_user_stats(owner)
+    project = Project.query.filter_by(owner_id=owner, name='Done').first()
+    assert RetentionService.purge_project_test_records(project.id) == 1
+
+    stats, _ = ProjectService.get_user_stats(owner)
+    assert stats is not first and stats['totalTests'] == 0
+
+
+def test_user_stats_snapshot_expires(app, owner, monkeypatch):
+    first, _ = ProjectService.get_user_stats(owner)
+    monkeypatch.setitem(app.config, 'STATS_CACHE_TTL', 0)
+    assert ProjectService.get_user_stats(owner)[0] is not first
+
+
+def test_user_projects_single_query_with_counts(owner, queries):
+    result, status = ProjectService.get_user_projects(owner)
+    assert status == 200
+    assert len(queries) == 1
+    assert result['total'] == 2
+    assert {p['name']: p['featureCount'] for p in result['projects']} == {'Done': 2, 'Draft': 2}
+    assert result['nextCursor'] is None
+
+
+def test_user_projects_keyset_pages(owner):
+    from datetime import datetime, timedelta
+    base = datetime(2024, 1, 1)
+    for i in range(5):
+        db.session.add(Project(name=f'P{i}', owner_id=owner, api_key=f'p{i}', updated_at=base + timedelta(days=i % 2)))
+    db.session.commit()
+
+    seen, cursor = [], None
+    while True:
+        result, _ = ProjectService.get_user_projects(owner, limit=3, cursor=cursor)
+        assert result['total'] == 7
+        seen += [p['id'] for p in result['projects']]
+        cursor = result['nextCursor']
+        if not cursor:
+            break
+    expected, _ = ProjectService.get_user_projects(owner, limit=50, with_total=False)
+    assert seen == [p['id'] for p in expected['projects']]
+    assert expected['total'] is None
+    assert ProjectService.get_user_projects(owner, limit=3, offset=3)[0]['projects'][0]['id'] == seen[3]
+
+
+def test_user_projects_rejects_bad_cursor(owner):
+    assert ProjectService.get_user_projects(owner, cursor='not-a-cursor')[1] == 400
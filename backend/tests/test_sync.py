@@ -0,0 +1,134 @@
+import pytest
+from app import db
+from app.models import User, Role, Project, Feature
+from app.services.code_index import CodeIndex
+from app.services.generator_service import GeneratorService
+from app.services.project_service import ProjectService
+
+FUNCTION_CODE = "def handler(input_data):\n    total = sum(max(x, 0) for x in input_data.get('values', []))\n    return {'total': total}"
+
+
+@pytest.fixture
+def project(app):
+    role = Role.query.filter_by(name='user').first()
+    user = User(email='sync@example.com', first_name='Sy', last_name='Nc', role_id=role.id)
+    user.set_password('Test123!')
+    db.session.add(user)
+    db.session.flush()
+    project = Project(name='Sync Project', owner_id=user.id, api_key='sync-key')
+    db.session.add(project)
+    db.session.flush()
+    db.session.add_all([
+        Feature(project_id=project.id, name='Books', feature_type='CRUD', configuration={
+            'table': 'books', 'fields': [{'name': 'title', 'type': 'string', 'required': True, 'default': 'Untitled'}]
+        }),
+        Feature(project_id=project.id, name='Totals', feature_type='FUNCTIONS', configuration={
+            'name': 'totals', 'code': FUNCTION_CODE
+        }),
+    ])
+    db.session.commit()
+    return project
+
+
+def _generated_files(project):
+    features = [{'name': f.name, 'type': f.feature_type, 'config': f.configuration} for f in project.features]
+    return GeneratorService.get_project_files({'name': project.name}, features)
+
+
+def test_code_index_parses_nested_calls():
+    index = CodeIndex(
+        "class Books(db.Model):\n"
+        "    title = db.Column(db.String(max(10, 120)), nullable=False)\n"
+        "    pages = db.Column(db.Integer, default=(1 + (2 * 3)))\n"
+    )
+    assert [(c['name'], c['type'], c['required']) for c in index.classes['Books']] == [
+        ('title', 'string', True), ('pages', 'integer', False)
+    ]
+
+
+def test_code_index_extracts_inline_route_code_without_trailer():
+    """Projects exported before handlers were hoisted still sync"""
+    body = ''.join(f"    {line}\n" for line in FUNCTION_CODE.split('\n'))
+    index = CodeIndex(
+        "@api_bp.route('/totals', methods=['POST'])\ndef route_totals():\n"
+        "    input_data = request.get_json() if request.is_json else {}\n" + body +
+        "\n    # Handle execution results\n"
+        "    if 'handler' in locals() and callable(locals()['handler']):\n"
+        "        return jsonify(locals()['handler'](input_data))\n"
+        "    if 'result' in locals():\n"
+        "        return jsonify(locals()['result'])\n"
+        "    return jsonify({'status': 'success'})\n"
+    )
+    assert index.routes['totals'] == FUNCTION_CODE
+
+
+@pytest.mark.parametrize('code', [FUNCTION_CODE, "total = input_data['a'] + 1\n\nresult = {'total': total}"])
+def test_code_index_round_trips_function_modules(code):
+    files = GeneratorService.get_project_files({}, [{'name': 'Totals', 'type': 'FUNCTIONS', 'config': {
+        'name': 'totals', 'code': code
+    }}])
+    assert CodeIndex(files['app/functions/totals.py']).function_code() == code
+    assert CodeIndex(files['app/routes/functions.py']).routes['totals'] == ''
+
+
+def test_sync_unchanged_files_is_noop(project):
+    files = _generated_files(project)
+    result, status = ProjectService.sync_from_files(project.id, project.owner_id, files)
+    assert status == 200
+    assert result['updated'] == []
+
+    result, _ = ProjectService.sync_from_files(project.id, project.owner_id, files)
+    assert sorted(result['skipped']) == ['app/functions/totals.py', 'app/models/crud.py', 'app/routes/functions.py']
+
+
+def test_sync_updates_fields_and_code(project):
+    files = _generated_files(project)
+    files['app/models/crud.py'] = files['app/models/crud.py'].replace(
+        "    title = db.Column(db.String(120), nullable=False)\n",
+        "    title = db.Column(db.String(120), nullable=False)\n    pages = db.Column(db.Integer)\n"
+    )
+    files['app/functions/totals.py'] = files['app/functions/totals.py'].replace("{'total': total}", "{'total': total * 2}")
+
+    result, status = ProjectService.sync_from_files(project.id, project.owner_id, files)
+    assert status == 200
+    assert sorted(result['updated']) == ['Books', 'Totals']
+
+    books = Feature.query.filter_by(project_id=project.id, name='Books').first()
+    assert books.configuration['fields'] == [
+        {'name': 'title', 'type': 'string', 'required': True, 'default': 'Untitled'},
+        {'name': 'pages', 'type': 'integer', 'required': False},
+    ]
+    totals = Feature.query.filter_by(project_id=project.id, name='Totals').first()
+    assert totals.configuration['code'].endswith("return {'total': total * 2}")
+
+
+def test_sync_reports_syntax_errors(project):
+    result, status = ProjectService.sync_from_files(project.id, project.owner_id, {'app/models/crud.py': 'class Broken(:'})
+    assert status == 200
+    assert 'app/models/crud.py' in result['errors']
+
+
+def test_sync_reads_index_flags(project):
+    files = _generated_files(project)
+    files['app/models/crud.py'] = files['app/models/crud.py'].replace(
+        "db.Column(db.String(120), nullable=False)", "db.Column(db.String(120), nullable=False, unique=True)"
+    )
+    result, _ = ProjectService.sync_from_files(project.id, project.owner_id, files)
+    assert result['updated'] == ['Books']
+
+    books = Feature.query.filter_by(project_id=project.id, name='Books').first()
+    assert books.configuration['fields'][0]['unique'] is True
+
+
+def test_sync_maps_colliding_function_names_to_their_modules(project):
+    db.session.add(Feature(project_id=project.id, name='Totals Copy', feature_type='FUNCTIONS', configuration={
+        'name': 'Totals', 'code': FUNCTION_CODE
+    }))
+    db.session.commit()
+    files = _generated_files(project)
+    files['app/functions/totals_2.py'] = files['app/functions/totals_2.py'].replace("{'total': total}", "{'total': -total}")
+
+    result, _ = ProjectService.sync_from_files(project.id, project.owner_id, files)
+    assert result['updated'] == ['Totals Copy']
+    copy = Feature.query.filter_by(project_id=project.id, name='Totals Copy').first()
+    assert copy.configuration['code'].endswith("return {'total': -total}")
@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta
+import pytest
+from app import db
+from app.models import User, Role, Project, Feature, ApiRequestLog, ApiUsageDaily, ApiUsageHourly
+from app.services.usage_service import UsageService
+
+
+@pytest.fixture
+def project(app):
+    role = Role.query.filter_by(name='user').first()
+    user = User(email='usage@example.com', first_name='Us', last_name='Age', role_id=role.id)
+    user.set_password('Test123!')
+    db.session.add(user)
+    db.session.flush()
+    project = Project(name='Usage', owner_id=user.id, api_key='usage-key')
+    db.session.add(project)
+    db.session.flush()
+    db.session.add(Feature(project_id=project.id, name='Books', feature_type='CRUD', configuration={}))
+    db.session.commit()
+    return project
+
+
+def _log(project, at, feature_id=None, record=True):
+    log = ApiRequestLog(project_id=project.id, feature_id=feature_id, method='GET', path='books', status_code=200, created_at=at)
+    db.session.add(log)
+    if record:
+        UsageService.record(log)
+    return log
+
+
+def _daily():
+    return sorted((r.day, r.feature_id, r.request_count) for r in ApiUsageDaily.query.all())
+
+
+def test_record_upserts_daily_and_hourly_buckets(project):
+    feature = project.features.first()
+    at = datetime(2024, 3, 1, 10, 15)
+    for minutes in (0, 30, 50):
+        _log(project, at + timedelta(minutes=minutes), feature.id)
+    _log(project, at)
+    db.session.commit()
+
+    assert _daily() == [(at.date(), 0, 1), (at.date(), feature.id, 3)]
+    hours = sorted((r.hour, r.feature_id, r.request_count) for r in ApiUsageHourly.query.all())
+    assert hours == [
+        (datetime(2024, 3, 1, 10), 0, 1), (datetime(2024, 3, 1, 10), feature.id, 2), (datetime(2024, 3, 1, 11), feature.id, 1)
+    ]
+
+
+def test_compact_rebuilds_closed_buckets_from_logs(project):
+    now = datetime.utcnow().replace(hour=12, minute=0, second=0, microsecond=0)
+    yesterday = now - timedelta(days=1)
+    _log(project, yesterday, record=False)
+    _log(project, now - timedelta(hours=2), record=False)
+    _log(project, now + timedelta(minutes=30))
+    db.session.commit()
+
+    result = UsageService.compact(yesterday, now=now)
+    assert result == {'days': 1, 'daily_rows': 1, 'hourly_rows': 2}
+    # Today's open daily bucket and the current hour keep the live counts from record()
+    assert _daily() == [(yesterday.date(), 0, 1), (now.date(), 0, 1)]
+    assert sorted((r.hour, r.request_count) for r in ApiUsageHourly.query.all()) == [
+        (yesterday, 1), (now - timedelta(hours=2), 1), (now, 1)
+    ]
+
+    # Idempotent, and days past retention keep their rollups
+    UsageService.compact(yesterday, log_retention_days=1, now=now)
+    assert _daily() == [(yesterday.date(), 0, 1), (now.date(), 0, 1)]
+
+
+def test_purge_deletes_in_batches(project):
+    now = datetime.utcnow()
+    for days in (40, 35, 31, 1):
+        _log(project, now - timedelta(days=days))
+    db.session.commit()
+
+    assert UsageService.purge(30, 14, batch_size=2) == {'logs': 3, 'hourly': 3}
+    assert ApiRequestLog.query.count() == 1
+    assert ApiUsageHourly.query.count() == 1
+    assert ApiUsageDaily.query.count() == 4
+
+
+def test_project_usage_reads_rollups(project):
+    now = datetime.utcnow()
+    _log(project, now)
+    _log(project, now - timedelta(days=3))
+    db.session.commit()
+
+    result, status = UsageService.get_project_usage(project.id, project.owner_id)
+    assert status == 200
+    assert [u['count'] for u in result['usage']] == [1, 1]
+    result, _ = UsageService.get_project_usage(project.id, project.owner_id, 'hour', days=1)
+    assert [u['count'] for u in result['usage']] == [1]
+    assert UsageService.get_project_usage(project.id, project.owner_id, 'week')[1] == 400
+    assert UsageService.get_project_usage(project.id, project.owner_id + 1)[1] == 403
+
+
+def test_usage_cli_commands(app, runner, project):
+    _log(project, datetime.utcnow() - timedelta(days=60))
+    _log(project, datetime.utcnow() - timedelta(days=1), record=False)
+    db.session.commit()
+
+    result = runner.invoke(args=['usage-rollup', '--days', '1'])
+    assert result.exit_code == 0, result.output
+    assert 'Rebuilt 1 daily and 1 hourly' in result.output
+
+    # Backfill stops at the log retention, leaving older rollups in place
+    result = runner.invoke(args=['usage-rollup', '--all'])
+    assert result.exit_code == 0, result.output
+    assert 'Rebuilt 1 daily and 1 hourly' in result.output
+    assert ApiUsageDaily.query.count() == 2
+
+    result = runner.invoke(args=['usage-purge'])
+    assert result.exit_code == 0, result.output
+    assert 'Purged 1 request log(s) and 1 hourly rollup row(s)' in result.output
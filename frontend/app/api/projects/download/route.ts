@@ -23,10 +23,8 @@ export async function POST(request: NextRequest) {
             body,
         })
 
-        // For blob responses (ZIP files)
-        const blob = await response.blob()
-
-        return new NextResponse(blob, {
+        // Pipe the streamed ZIP through instead of buffering it as a blob
+        return new NextResponse(response.body, {
             status: response.status,
             headers: {
                 'Content-Type': response.headers.get('Content-Type') || 'application/zip',
@@ -51,6 +51,22 @@ export function Step1ProjectInfo({ state, updateProjectInfo, errors }: Step1Prop
         </select>
       </div>
 
+      <div className="space-y-2">
+        <label className="text-sm font-medium text-foreground">Server</label>
+        <select
+          value={state.projectInfo.options?.target ?? "flask"}
+          onChange={(e) =>
+            updateProjectInfo({
+              options: { ...state.projectInfo.options, target: e.target.value as "flask" | "asgi" },
+            })
+          }
+          className="w-full bg-surface-secondary border border-border rounded-lg px-4 py-2 text-foreground focus:outline-none focus:border-primary transition-colors"
+        >
+          <option value="flask">Flask (WSGI)</option>
+          <option value="asgi">Quart (ASGI, async SQLAlchemy)</option>
+        </select>
+      </div>
+
       <div className="bg-surface-secondary border border-border rounded-lg p-4">
         <p className="text-sm text-muted">
           <span className="font-semibold text-foreground">Tip:</span> You can always modify these details later in
@@ -9,6 +9,7 @@ const initialState: WizardState = {
     name: "",
     description: "",
     environment: "development",
+    options: { target: "flask" },
   },
   selectedFeatures: [],
 }
@@ -27,6 +27,10 @@ export interface WizardState {
     name: string
     description: string
     environment: string
+    options?: {
+      profile?: string
+      target?: "flask" | "asgi"
+    }
   }
   selectedFeatures: Feature[]
   testResults?: Record<string, any>